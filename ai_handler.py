@@ -9,22 +9,320 @@ Author: Automated Job Application System
 Version: 2.0
 """
 
+import asyncio
+import atexit
+import functools
+import hashlib
 import json
-from typing import Dict, List, Any, Tuple
+import re
+import math
+import shelve
+import time
+from typing import Dict, List, Any, Optional, Tuple, Awaitable
 import openai
 
 
+# Cached answers older than this are asked again, so profile-independent wording changes get picked up
+ANSWER_CACHE_TTL = 30 * 24 * 3600
+
+# Semantic cache: option fields whose summaries embed closer than this reuse an earlier answer
+EMBEDDING_MODEL = "text-embedding-3-small"
+SEMANTIC_THRESHOLD = 0.95
+
+# Answer caches shared by every handler in the process, one per path (dbm allows a single writer)
+_ANSWER_CACHES: Dict[str, shelve.Shelf] = {}
+
+
+def _open_answer_cache(path: str) -> shelve.Shelf:
+    """Open (once per process) the on-disk field answer cache at path"""
+    if path not in _ANSWER_CACHES:
+        cache = shelve.open(path, writeback=False)
+        atexit.register(cache.close)
+        _ANSWER_CACHES[path] = cache
+    return _ANSWER_CACHES[path]
+
+
+def field_key(el: Dict[str, Any]) -> str:
+    """The full_key the prompts ask the model to answer under, built once and kept on the element info"""
+    full_key = el.get('full_key')
+    if full_key is None:
+        full_key = el['full_key'] = "[" + ", ".join(map(str, (
+            el['question'], el['input_id'], el['input_type'], el['aria_labelledby'], el['input_tag']
+        ))) + "]"
+    return full_key
+
+
+def _schema_key(el: Dict[str, Any]) -> str:
+    """What a field asks and accepts, identical for the same field in every repeated panel
+    
+    Built from question, type and options; the digit-free id tail only keeps same-labelled date
+    parts (month/year) apart, since raw input_ids carry per-panel numbers.
+    """
+    options = ' | '.join(map(str, el.get('options') or ()))
+    return f"[{el['question']}, {_id_suffix(el['input_id'])}, {el['input_type']}, {options}]"
+
+
+# aria_labelledby of a numbered repeated panel (e.g. "Work-Experience-2-panel"), whose fields are per entry
+_REPEATED_PANEL_RE = re.compile(r'\b\d+-panel\b')
+
+
+def _question_key(el: Dict[str, Any]) -> Tuple:
+    """What a field asks regardless of where it sits; numbered panels stay apart by their aria_labelledby"""
+    aria_labelledby = el['aria_labelledby']
+    panel = aria_labelledby if aria_labelledby and _REPEATED_PANEL_RE.search(aria_labelledby) else None
+    return (el['question'], el['input_id'], el['input_type'], el['input_tag'], panel,
+            tuple(map(str, el.get('options') or ())))
+
+
+def _parse_json_content(content: str) -> Any:
+    """Parse a model reply, tolerating a ```json fence around it"""
+    content = content.strip()
+    if content.startswith("```json"):
+        content = content[7:]
+    if content.endswith("```"):
+        content = content[:-3]
+    return json.loads(content)
+
+
+def _profile_hash(current_data: Dict[str, Any]) -> str:
+    """Short stable hash of a profile entry, namespacing every cache entry made for it"""
+    return hashlib.blake2b(
+        json.dumps(current_data, sort_keys=True, default=str).encode('utf-8'), digest_size=16
+    ).hexdigest()
+
+
+def _id_suffix(input_id: Any) -> str:
+    """The stable tail of an input id (e.g. "dateSectionMonth-input"), without per-load numbers"""
+    return re.sub(r'\d+', '', str(input_id or '').rsplit('--', 1)[-1])
+
+
+def _field_summary(el: Dict[str, Any]) -> str:
+    """The text embedded for a field: what it asks and accepts, without per-load ids or option order
+    
+    The id suffix keeps sibling parts sharing one question (date Month/Day/Year) apart.
+    """
+    options = sorted(map(str, el.get('options') or []))
+    return (f"{el['question']} || {_id_suffix(el['input_id'])} || {el['input_type']} || "
+            f"{el['input_tag']} || {' | '.join(options)}")
+
+
+def _cosine(a: List[float], b: List[float]) -> float:
+    """Cosine similarity of two embeddings"""
+    dot = sum(x * y for x, y in zip(a, b))
+    norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+    return dot / norm if norm else 0.0
+
+
+def _fits_options(el: Dict[str, Any], answer: Any) -> bool:
+    """Whether a reused answer is still a valid choice for this field's options"""
+    options = el.get('options')
+    if not options or answer == "SKIP":
+        return True
+    chosen = answer if isinstance(answer, list) else [answer]
+    return all(choice in options for choice in chosen)
+
+
+async def _lookup_semantic(handler, kind: str, current_data: Dict[str, Any],
+                           misses: List[Dict[str, Any]]) -> Tuple[Dict[str, Any], Dict[str, List[float]]]:
+    """Answer exact-cache misses from earlier fields that ask the same thing in other words
+    
+    Only option fields take part: a reused answer must be one of the field's options, while
+    free-text and date fields with near-identical wording (Address Line 1/2) need distinct answers.
+    Returns (answers reused from similar fields, embedding per full_key for the option fields still missing).
+    """
+    misses = [el for el in misses if el.get('options')]
+    if handler.answer_cache is None or not misses:
+        return {}, {}
+    try:
+        response = await handler.client.embeddings.create(
+            model=EMBEDDING_MODEL, input=[_field_summary(el) for el in misses]
+        )
+    except Exception as e:
+        print(f"Semantic cache unavailable: {e}")
+        return {}, {}
+    
+    now = time.time()
+    index = [entry for entry in handler.answer_cache.get(_semantic_key(current_data, kind), [])
+             if now - entry[0] < handler.cache_ttl]
+    answers, embeddings = {}, {}
+    for el, item in zip(misses, response.data):
+        full_key = field_key(el)
+        best = max(index, key=lambda entry: _cosine(item.embedding, entry[1]), default=None)
+        if (best is not None and _cosine(item.embedding, best[1]) > SEMANTIC_THRESHOLD
+                and _fits_options(el, best[2])):
+            answers[full_key] = best[2]
+        else:
+            embeddings[full_key] = item.embedding
+    if answers:
+        print(f"AI semantic cache: {len(answers)} of {len(misses)} uncached fields matched an earlier question")
+    return answers, embeddings
+
+
+def _semantic_key(current_data: Dict[str, Any], kind: str) -> str:
+    """Shelve key of the (stored_at, embedding, answer) list for one profile entry and prompt"""
+    return f"semantic|{_profile_hash(current_data)}|{kind}"
+
+
+def _store_semantic(handler, kind: str, current_data: Dict[str, Any],
+                    embeddings: Dict[str, List[float]], fresh: Dict[str, Any]) -> None:
+    """Add freshly generated answers to the semantic index, dropping expired entries"""
+    if handler.answer_cache is None or not embeddings:
+        return
+    key = _semantic_key(current_data, kind)
+    now = time.time()
+    index = [entry for entry in handler.answer_cache.get(key, []) if now - entry[0] < handler.cache_ttl]
+    index.extend((now, embeddings[full_key], value) for full_key, value in fresh.items() if full_key in embeddings)
+    handler.answer_cache[key] = index
+
+
+def _lookup_cached(handler, kind: str, current_data: Dict[str, Any],
+                   panel_elements: List[Dict[str, Any]]) -> Tuple[Dict[str, Any], Dict[str, Any], Dict[str, str]]:
+    """Split panel_elements into cached answers and cache keys for the rest
+    
+    Returns (answers found in the cache, key_mapping for every field, cache key per full_key).
+    """
+    key_mapping = {field_key(el): el for el in panel_elements}
+    if handler.answer_cache is None:
+        return {}, key_mapping, {}
+    
+    profile_hash = _profile_hash(current_data)
+    cache_keys = {
+        full_key: hashlib.blake2b(
+            f"{profile_hash}|{kind}|{full_key}|{el.get('options')}".encode('utf-8'), digest_size=16
+        ).hexdigest()
+        for full_key, el in key_mapping.items()
+    }
+    answers = {}
+    for full_key, cache_key in cache_keys.items():
+        entry = handler.answer_cache.get(cache_key)
+        # Entries are (stored_at, answer); anything else predates the TTL and is asked again
+        if isinstance(entry, tuple) and time.time() - entry[0] < handler.cache_ttl:
+            answers[full_key] = entry[1]
+    if answers:
+        print(f"AI answer cache: {len(answers)} of {len(key_mapping)} fields served from cache")
+    return answers, key_mapping, cache_keys
+
+
+def _store_cached(handler, cache_keys: Dict[str, str], fresh: Dict[str, Any]) -> None:
+    """Remember freshly generated answers under the keys from _lookup_cached"""
+    if handler.answer_cache is None:
+        return
+    stored_at = time.time()
+    for full_key, value in fresh.items():
+        if full_key in cache_keys:
+            handler.answer_cache[cache_keys[full_key]] = (stored_at, value)
+    handler.answer_cache.sync()
+
+
+def _cached_by_field(method):
+    """Serve fields answered before (same profile, prompt, field and options) from the answer cache
+    
+    Option fields the exact cache misses are embedded and matched against earlier fields of the
+    same profile and prompt, so a reworded or reordered question can reuse its answer. Only fields
+    neither cache answers are sent to the wrapped method, once per distinct question (see
+    _question_key); its answers are copied to the repeats and stored in both caches.
+    """
+    @functools.wraps(method)
+    async def wrapper(self, current_data: Dict[str, Any], panel_elements: List[Dict[str, Any]]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        answers, key_mapping, cache_keys = _lookup_cached(self, method.__name__, current_data, panel_elements)
+        misses = [el for full_key, el in key_mapping.items() if full_key not in answers]
+        
+        similar, embeddings = await _lookup_semantic(self, method.__name__, current_data, misses)
+        if similar:
+            _store_cached(self, cache_keys, similar)
+            answers.update(similar)
+            misses = [el for el in misses if field_key(el) not in similar]
+        
+        if misses:
+            # Ask each distinct question once and copy its answer to the fields repeating it
+            groups: Dict[Tuple, List[Dict[str, Any]]] = {}
+            for el in misses:
+                groups.setdefault(_question_key(el), []).append(el)
+            fresh, _ = await method(self, current_data, [group[0] for group in groups.values()])
+            for group in groups.values():
+                representative = field_key(group[0])
+                if representative in fresh:
+                    for el in group[1:]:
+                        fresh[field_key(el)] = fresh[representative]
+            _store_semantic(self, method.__name__, current_data, embeddings, fresh)
+            _store_cached(self, cache_keys, fresh)
+            answers.update(fresh)
+        return answers, key_mapping
+    return wrapper
+
+
+# Per-panel prompts send each field as a compact list; full_key already carries the rest
+_FORM_FIELDS_HEADER = (
+    "Form Fields, each as [full_key, options, placeholder, required], where full_key is "
+    "[question, input_id, input_type, aria_labelledby, input_tag]:"
+)
+
+
+def _panel_messages(instructions: str, current_data: Dict[str, Any],
+                    form_fields: List[Dict[str, Any]]) -> List[Dict[str, str]]:
+    """Chat messages for a per-panel prompt, with everything but the form fields in a fixed prefix
+    
+    form_fields holds one [full_key, options, placeholder, required] list per field; both it
+    and the profile are serialized without whitespace to keep the prompt short.
+    
+    The system message depends only on the prompt and the profile entry, so it stays byte-identical
+    across the panels of an application and OpenAI's automatic prompt caching can reuse it.
+    """
+    profile = json.dumps(current_data, separators=(',', ':'), sort_keys=True, default=str)
+    return [
+        {"role": "system", "content": f"{instructions}\nData from User Profile:\n{profile}\n"},
+        {"role": "user", "content": f"{_FORM_FIELDS_HEADER}\n{json.dumps(form_fields, separators=(',', ':'))}"},
+    ]
+
+
+# Field rules shared by the per-panel and repeated-panel section prompts
+_SECTION_FIELD_RULES = """IMPORTANT RULES:
+- For language fields asking fluency, use the closest match from the options list even if its not mentioned and make sure to fill all the listboxes about language fluency based on multiple metrics.
+- Note that fill all the listboxes about langauge fluency that are present in the form.
+- For fields with "options" not None:
+  - You MUST select ONLY from the list of provided OPTIONS (case-sensitive)
+  - If the user data is longer (e.g., "Bachelor of Engineering in Computer Science") and options are shorter (e.g., "BS"), choose the CLOSEST MATCH based on meaning
+  - If no match is appropriate, use "SKIP"
+- For radio_group fields:
+  - You MUST select ONLY necessary options from the provided options list
+  - Choose the option that best matches the user's profile or a reasonable default
+  - Use EXACT text from the options list (case-sensitive)
+- For date fields: Month should be number format (e.g., "01" for January), year should be "YYYY" format
+- For date-related fields (e.g. type="spinbutton" or input_id includes "Month" or "Year"):
+  - Use "MM" format for months (e.g., "01" for January)
+  - Use "YYYY" format for years (e.g., "2022")
+  - Match "start date", "end date", "graduation date", etc., with the corresponding data from user profile
+- Make sure not to skip voluntary disclosure questions about gender, ethnicity, disability, and veteran status and other similar questions
+- For text fields: Keep responses concise and relevant
+- Match options exactly as they appear in the options list (case-sensitive) when options is not None
+- After filling the form, if a field for save and continue is present, respond with yes to save the form
+
+SPECIAL HANDLING FOR SKILLS/MULTI-VALUE FIELDS:
+- For fields related to skills, technologies, competencies, or any field that should contain multiple items:
+  - Return an ARRAY of strings instead of a single comma-separated string
+  - Each skill/technology should be a separate string in the array
+  - Example: ["C#", "TypeScript", "Java", "SQL", "HTML5", "CSS3", "Python"] instead of "C#, TypeScript, Java, SQL, HTML5, CSS3, Python"
+- Identify skills fields by keywords in the question like: "skills", "technologies", "competencies", "tools", "programming languages", etc.
+"""
+
+
 class AIResponseHandler:
     """Class to handle all AI responses for job application form filling"""
     
-    def __init__(self, openai_client: openai.AsyncOpenAI):
+    def __init__(self, openai_client: openai.AsyncOpenAI, cache_path: Optional[str] = ".ai_cache",
+                 cache_ttl: float = ANSWER_CACHE_TTL):
         """Initialize the AI response handler
         
         Args:
             openai_client: Initialized OpenAI async client
+            cache_path: On-disk answer cache shared across runs; None disables caching
+            cache_ttl: Seconds a cached answer stays valid
         """
         self.client = openai_client
+        self.cache_ttl = cache_ttl
+        self.answer_cache = _open_answer_cache(cache_path) if cache_path else None
     
+    @_cached_by_field
     async def get_ai_response_without_skipping(self, current_data: Dict[str, Any], panel_elements: List[Dict[str, Any]]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
         """Get AI response for form fields using OpenAI without skipping any fields"""
         try:
@@ -32,24 +330,13 @@ class AIResponseHandler:
             key_mapping = {}
 
             for el in panel_elements:
-                full_key = f"[{el['question']}, {el['input_id']}, {el['input_type']}, {el['aria_labelledby']}, {el['input_tag']}]"
+                full_key = field_key(el)
                 
-                form_fields.append({
-                    "full_key": full_key,
-                    "question": el['question'],
-                    "input_id": el['input_id'],
-                    "input_type": el['input_type'],
-                    "input_tag": el['input_tag'],
-                    "aria_labelledby": el['aria_labelledby'],
-                    "options": el['options'], 
-                    "placeholder": el.get('placeholder'),
-                    "required": el.get('required'),
-                    "role": el.get('role')
-                })
+                form_fields.append([full_key, el['options'], el.get('placeholder'), el.get('required')])
                 
                 key_mapping[full_key] = el
 
-            prompt = f"""
+            instructions = """
 You are helping fill a job application form.
 You are mapping user profile data to a web job application form.
 
@@ -89,42 +376,30 @@ SPECIAL HANDLING FOR SKILLS/MULTI-VALUE FIELDS:
   - Example: ["C#", "TypeScript", "Java", "SQL", "HTML5", "CSS3", "Python"] instead of "C#, TypeScript, Java, SQL, HTML5, CSS3, Python"
 - Identify skills fields by keywords in the question like: "skills", "technologies", "competencies", "tools", "programming languages", etc.
 
-Data from User Profile:
-{json.dumps(current_data, indent=2)}
-
-Form Fields:
-{json.dumps(form_fields, indent=2)}
-
 Example response format:
-{{
+{
   "[School or University*, unknown, text, Education-(Optional)-2-panel, input]": "University Name",
   "[Degree*, unknown, button, Education-(Optional)-2-panel, button]": "MS",
   "[Field of Study, unknown, unknown, Education-(Optional)-2-panel, input]": "Computer Science",
   "[Type to Add Skills, unknown, unknown, Skills-section, input]": ["C#", "TypeScript", "Java", "SQL", "HTML5", "CSS3", "Python", ".NET Core", "Angular 2+", "RxJS", "Entity Framework", "React", "Redux", "Bootstrap 4"]
-}}
+}
 
 Respond ONLY with a valid JSON object using the exact "full_key" values as keys.
 """
             
             response = await self.client.chat.completions.create(
                 model="o4-mini",
-                messages=[{"role": "user", "content": prompt}]
+                messages=_panel_messages(instructions, current_data, form_fields),
+                response_format={"type": "json_object"}
             )
-            content = response.choices[0].message.content.strip()
-            
-            # Clean up the response to extract JSON
-            if content.startswith("```json"):
-                content = content[7:]
-            if content.endswith("```"):
-                content = content[:-3]
-            
-            ai_response = json.loads(content)
+            ai_response = json.loads(response.choices[0].message.content)
             return ai_response, key_mapping
             
         except Exception as e:
             print(f"Error in get_ai_response_without_skipping: {e}")
             return {}, {}
 
+    @_cached_by_field
     async def get_ai_response_for_personal_information(self, current_data: Dict[str, Any], panel_elements: List[Dict[str, Any]]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
         """Get AI response for personal information form fields using OpenAI"""
         try:
@@ -132,24 +407,13 @@ Respond ONLY with a valid JSON object using the exact "full_key" values as keys.
             key_mapping = {}
 
             for el in panel_elements:
-                full_key = f"[{el['question']}, {el['input_id']}, {el['input_type']}, {el['aria_labelledby']}, {el['input_tag']}]"
+                full_key = field_key(el)
                 
-                form_fields.append({
-                    "full_key": full_key,
-                    "question": el['question'],
-                    "input_id": el['input_id'],
-                    "input_type": el['input_type'],
-                    "input_tag": el['input_tag'],
-                    "aria_labelledby": el['aria_labelledby'],
-                    "options": el['options'], 
-                    "placeholder": el.get('placeholder'),
-                    "required": el.get('required'),
-                    "role": el.get('role')
-                })
+                form_fields.append([full_key, el['options'], el.get('placeholder'), el.get('required')])
                 
                 key_mapping[full_key] = el
 
-            prompt = f"""
+            instructions = """
 You are helping fill a job application form.
 You are mapping user profile data to a web job application form.
 
@@ -182,42 +446,30 @@ SPECIAL HANDLING FOR SKILLS/MULTI-VALUE FIELDS:
   - Example: ["C#", "TypeScript", "Java", "SQL", "HTML5", "CSS3", "Python"] instead of "C#, TypeScript, Java, SQL, HTML5, CSS3, Python"
 - Identify skills fields by keywords in the question like: "skills", "technologies", "competencies", "tools", "programming languages", etc.
 
-Data from User Profile:
-{json.dumps(current_data, indent=2)}
-
-Form Fields:
-{json.dumps(form_fields, indent=2)}
-
 Example response format:
-{{
+{
   "[School or University*, unknown, text, Education-(Optional)-2-panel, input]": "University Name",
   "[Degree*, unknown, button, Education-(Optional)-2-panel, button]": "MS",
   "[Field of Study, unknown, unknown, Education-(Optional)-2-panel, input]": "Computer Science",
   "[Type to Add Skills, unknown, unknown, Skills-section, input]": ["C#", "TypeScript", "Java", "SQL", "HTML5", "CSS3", "Python", ".NET Core", "Angular 2+", "RxJS", "Entity Framework", "React", "Redux", "Bootstrap 4"]
-}}
+}
 
 Respond ONLY with a valid JSON object using the exact "full_key" values as keys.
 """
             
             response = await self.client.chat.completions.create(
                 model="o4-mini",
-                messages=[{"role": "user", "content": prompt}]
+                messages=_panel_messages(instructions, current_data, form_fields),
+                response_format={"type": "json_object"}
             )
-            content = response.choices[0].message.content.strip()
-            
-            # Clean up the response to extract JSON
-            if content.startswith("```json"):
-                content = content[7:]
-            if content.endswith("```"):
-                content = content[:-3]
-            
-            ai_response = json.loads(content)
+            ai_response = json.loads(response.choices[0].message.content)
             return ai_response, key_mapping
             
         except Exception as e:
             print(f"Error in get_ai_response_for_personal_information: {e}")
             return {}, {}
 
+    @_cached_by_field
     async def get_ai_response_for_section(self, current_data: Dict[str, Any], panel_elements: List[Dict[str, Any]]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
         """Get AI response for general form section fields using OpenAI"""
         try:
@@ -225,24 +477,13 @@ Respond ONLY with a valid JSON object using the exact "full_key" values as keys.
             key_mapping = {}
 
             for el in panel_elements:
-                full_key = f"[{el['question']}, {el['input_id']}, {el['input_type']}, {el['aria_labelledby']}, {el['input_tag']}]"
+                full_key = field_key(el)
                 
-                form_fields.append({
-                    "full_key": full_key,
-                    "question": el['question'],
-                    "input_id": el['input_id'],
-                    "input_type": el['input_type'],
-                    "input_tag": el['input_tag'],
-                    "aria_labelledby": el['aria_labelledby'],
-                    "options": el['options'], 
-                    "placeholder": el.get('placeholder'),
-                    "required": el.get('required'),
-                    "role": el.get('role')
-                })
+                form_fields.append([full_key, el['options'], el.get('placeholder'), el.get('required')])
                 
                 key_mapping[full_key] = el
 
-            prompt = f"""
+            instructions = f"""
 You are helping fill a job application form.
 You are mapping user profile data to a web form.
 
@@ -254,40 +495,7 @@ Return a JSON dictionary mapping the EXACT "full_key" values to appropriate valu
 
 CRITICAL: You MUST use the EXACT "full_key" value as the key in your response JSON. Do NOT use just the question text.
 
-IMPORTANT RULES:
-- For language fields asking fluency, use the closest match from the options list even if its not mentioned and make sure to fill all the listboxes about language fluency based on multiple metrics.
-- Note that fill all the listboxes about langauge fluency that are present in the form.
-- For fields with "options" not None:
-  - You MUST select ONLY from the list of provided OPTIONS (case-sensitive)
-  - If the user data is longer (e.g., "Bachelor of Engineering in Computer Science") and options are shorter (e.g., "BS"), choose the CLOSEST MATCH based on meaning
-  - If no match is appropriate, use "SKIP"
-- For radio_group fields:
-  - You MUST select ONLY necessary options from the provided options list
-  - Choose the option that best matches the user's profile or a reasonable default
-  - Use EXACT text from the options list (case-sensitive)
-- For date fields: Month should be number format (e.g., "01" for January), year should be "YYYY" format
-- For date-related fields (e.g. type="spinbutton" or input_id includes "Month" or "Year"):
-  - Use "MM" format for months (e.g., "01" for January)
-  - Use "YYYY" format for years (e.g., "2022")
-  - Match "start date", "end date", "graduation date", etc., with the corresponding data from user profile
-- Make sure not to skip voluntary disclosure questions about gender, ethnicity, disability, and veteran status and other similar questions
-- For text fields: Keep responses concise and relevant
-- Match options exactly as they appear in the options list (case-sensitive) when options is not None
-- After filling the form, if a field for save and continue is present, respond with yes to save the form
-
-SPECIAL HANDLING FOR SKILLS/MULTI-VALUE FIELDS:
-- For fields related to skills, technologies, competencies, or any field that should contain multiple items:
-  - Return an ARRAY of strings instead of a single comma-separated string
-  - Each skill/technology should be a separate string in the array
-  - Example: ["C#", "TypeScript", "Java", "SQL", "HTML5", "CSS3", "Python"] instead of "C#, TypeScript, Java, SQL, HTML5, CSS3, Python"
-- Identify skills fields by keywords in the question like: "skills", "technologies", "competencies", "tools", "programming languages", etc.
-
-Data from User Profile:
-{json.dumps(current_data, indent=2)}
-
-Form Fields:
-{json.dumps(form_fields, indent=2)}
-
+{_SECTION_FIELD_RULES}
 Example response format:
 {{
   "[School or University*, unknown, text, Education-(Optional)-2-panel, input]": "University Name",
@@ -301,19 +509,152 @@ Respond ONLY with a valid JSON object using the exact "full_key" values as keys.
             
             response = await self.client.chat.completions.create(
                 model="o4-mini",
-                messages=[{"role": "user", "content": prompt}]
+                messages=_panel_messages(instructions, current_data, form_fields),
+                response_format={"type": "json_object"}
             )
-            content = response.choices[0].message.content.strip()
-            
-            # Clean up the response to extract JSON
-            if content.startswith("```json"):
-                content = content[7:]
-            if content.endswith("```"):
-                content = content[:-3]
-            
-            ai_response = json.loads(content)
+            ai_response = json.loads(response.choices[0].message.content)
             return ai_response, key_mapping
             
         except Exception as e:
             print(f"Error in get_ai_response_for_section: {e}")
             return {}, {}
+
+    def uncached_section_fields(self, current_data: Dict[str, Any],
+                                panel_elements: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """The panel_elements get_ai_response_for_section would still have to ask the model about"""
+        answers, key_mapping, _ = _lookup_cached(self, 'get_ai_response_for_section', current_data, panel_elements)
+        return [el for full_key, el in key_mapping.items() if full_key not in answers]
+    
+    async def get_repeated_schema_answers(self, entries: List[Dict[str, Any]],
+                                          schema_elements: List[Dict[str, Any]]) -> Optional[List[Dict[str, Any]]]:
+        """Answer one panel schema for every profile entry in a single prompt
+        
+        Args:
+            entries: User profile entries, one per repeated panel
+            schema_elements: The fields one panel contains
+            
+        Returns:
+            One mapping of schema key to answer per entry, or None if the reply was unusable
+        """
+        try:
+            form_fields = [
+                {
+                    "schema_key": _schema_key(el),
+                    "question": el['question'],
+                    "input_id": el['input_id'],
+                    "input_type": el['input_type'],
+                    "input_tag": el['input_tag'],
+                    "options": el['options'],
+                    "placeholder": el.get('placeholder'),
+                    "required": el.get('required'),
+                    "role": el.get('role')
+                }
+                for el in schema_elements
+            ]
+            
+            prompt = f"""
+You are helping fill a job application form.
+You are mapping user profile data to a web form.
+
+You are given:
+- A list of {len(entries)} entries from user profile data (JSON), one per repeated panel of the form
+- The list of form fields every one of those panels contains (including labels, field types, and available options if there is dropdown for the element)
+
+Return a JSON array with exactly {len(entries)} objects, in the same order as the entries. Each object maps the EXACT "schema_key" values to appropriate values for that entry. Use the entry's data to fill the values. If a field is not relevant, map it to "SKIP".
+
+CRITICAL: You MUST use the EXACT "schema_key" value as the key in each object. Do NOT use just the question text.
+
+{_SECTION_FIELD_RULES}
+Profile Entries:
+{json.dumps(entries, separators=(',', ':'))}
+
+Form Fields (same for every panel):
+{json.dumps(form_fields, separators=(',', ':'))}
+
+Respond ONLY with a valid JSON array of objects using the exact "schema_key" values as keys.
+"""
+            
+            response = await self.client.chat.completions.create(
+                model="o4-mini",
+                messages=[{"role": "user", "content": prompt}]
+            )
+            per_entry = _parse_json_content(response.choices[0].message.content)
+            if not isinstance(per_entry, list) or len(per_entry) != len(entries):
+                raise ValueError(f"expected {len(entries)} answer objects, got {type(per_entry).__name__}")
+            return per_entry
+            
+        except Exception as e:
+            print(f"Error in get_repeated_schema_answers: {e}")
+            return None
+    
+    async def get_ai_responses_for_repeated_panels(self, items_data: List[Dict[str, Any]],
+                                                   panels: List[List[Dict[str, Any]]],
+                                                   prefetched: Optional[Awaitable[Optional[List[Dict[str, Any]]]]] = None
+                                                   ) -> List[Tuple[Dict[str, Any], Dict[str, Any]]]:
+        """Answer several panels that share one schema (e.g. each work experience) in a single prompt
+        
+        The schema is sent once with every profile entry instead of once per panel. Panels whose
+        schemas differ, or that the combined reply did not answer in full, fall back to one
+        get_ai_response_for_section call each.
+        
+        Args:
+            items_data: One user profile entry per panel
+            panels: The panel_elements of each panel, in the same order
+            prefetched: A get_repeated_schema_answers call for all of items_data started early;
+                panels whose fields it answered are served from it
+            
+        Returns:
+            (ai_values, key_mapping) per panel, as get_ai_response_for_section returns them
+        """
+        results = []
+        pending = []  # (panel index, fields missing from the cache, cache keys)
+        for index, (item_data, panel_elements) in enumerate(zip(items_data, panels)):
+            answers, key_mapping, cache_keys = _lookup_cached(self, 'get_ai_response_for_section', item_data, panel_elements)
+            results.append((answers, key_mapping))
+            misses = [el for full_key, el in key_mapping.items() if full_key not in answers]
+            if misses:
+                pending.append((index, misses, cache_keys))
+        
+        def apply(batch, by_index):
+            """Fill the panels the model answered in full and return the rest"""
+            unserved = []
+            for index, misses, cache_keys in batch:
+                entry_answers = by_index.get(index)
+                if not (isinstance(entry_answers, dict)
+                        and all(_schema_key(el) in entry_answers for el in misses)):
+                    unserved.append((index, misses, cache_keys))
+                    continue
+                fresh = {field_key(el): entry_answers[_schema_key(el)] for el in misses}
+                _store_cached(self, cache_keys, fresh)
+                results[index][0].update(fresh)
+            return unserved
+        
+        async def answer_each(batch):
+            """Ask for each panel on its own, as the per-panel path always did"""
+            fallbacks = await asyncio.gather(*(
+                self.get_ai_response_for_section(items_data[index], misses) for index, misses, _ in batch
+            ))
+            for (index, _, _), (fresh, _) in zip(batch, fallbacks):
+                results[index][0].update(fresh)
+        
+        if prefetched is not None:
+            per_entry = await prefetched
+            if per_entry is not None:
+                # Only panels whose every missing field is in the prefetched schema can use it
+                pending = apply(pending, dict(enumerate(per_entry)))
+        
+        if not pending:
+            return results
+        
+        schemas = [sorted(_schema_key(el) for el in misses) for _, misses, _ in pending]
+        if len(pending) > 1 and all(schema == schemas[0] for schema in schemas):
+            per_entry = await self.get_repeated_schema_answers(
+                [items_data[index] for index, _, _ in pending], pending[0][1]
+            )
+            if per_entry is not None:
+                pending = apply(pending, dict(zip((index for index, _, _ in pending), per_entry)))
+        
+        # Differing schemas, a failed combined reply, or entries missing fields are asked per panel
+        if pending:
+            await answer_each(pending)
+        return results
@@ -7,10 +7,24 @@ This script reads job URLs from jobagent.jobs.json and processes
 """
 
 import asyncio
+import itertools
+import logging
 import json
 import sys
 import signal
-from final import JobApplicationBot
+from playwright.async_api import Error as PlaywrightError, TimeoutError as PlaywrightTimeoutError
+from final import JobApplicationBotPool, SectionDispatch
+
+# Section processors keyed by keywords matched against a section's aria-labelledby;
+# a None processor means the section is skipped, unmatched sections go to the generic processor
+_DISPATCH = SectionDispatch([
+    (("work", "experience", "history"), "_process_experience_section"),
+    (("education",), "_process_education_section"),
+    (("language",), "_process_language_section"),
+    (("skill",), "_process_skills_section"),
+    (("resume", "document"), "_process_resume_section"),
+    (("website", "portfolio"), None),  # Skip website/portfolio sections for now
+])
 
 # Global counters
 GLOBAL_STATS = {
@@ -41,52 +55,46 @@ def signal_handler(signum, frame):
 # Set up signal handler for graceful shutdown
 signal.signal(signal.SIGINT, signal_handler)
 
-async def process_single_application(url, semaphore, application_index):
-    """Process a single job application with 10-minute timeout"""
-    async with semaphore:  # Limit concurrent applications
-        bot = JobApplicationBot()
-        was_submitted = False
+async def process_single_application(bot, url, application_index):
+    """Process a single job application with 15-minute timeout
+
+    The bot is handed out by JobApplicationBotPool with its company and context
+    already set up; the pool closes the context once this returns.
+    """
+    was_submitted = False
+    
+    try:
+        print(f"\n=== Starting Application {application_index + 1}: {url} ===")
+        print(f"[App {application_index + 1}] Timeout set to 15 minutes")
         
-        try:
-            print(f"\n=== Starting Application {application_index + 1}: {url} ===")
-            print(f"[App {application_index + 1}] Timeout set to 15 minutes")
+        # Wrap the entire process in a timeout
+        async with asyncio.timeout(900):  # 900 seconds = 15 minutes
+            # Navigate to job
+            print(f"[App {application_index + 1}] Navigating to job page...")
+            await bot.navigate_to_job(bot.company)
             
-            # Wrap the entire process in a timeout
-            async with asyncio.timeout(900):  # 900 seconds = 15 minutes
-                # Add the custom URL to the bot's company_urls
-                custom_company_name = f"batch_job_{application_index + 1}"
-                bot.company_urls[custom_company_name] = url
-
-                # Set the company for proper logging
-                bot.set_company(custom_company_name)
-                # Initialize browser
-                print(f"[App {application_index + 1}] Initializing browser...")
-                await bot.initialize_browser(headless=False)  # Use headless for batch processing
-
-                # Navigate to job
-                print(f"[App {application_index + 1}] Navigating to job page...")
-                await bot.navigate_to_job(custom_company_name)
-                
-                # Additional steps for custom links before authentication
-                print(f"[App {application_index + 1}] Waiting for page to load and clicking apply buttons...")
+            # Additional steps for custom links before authentication
+            print(f"[App {application_index + 1}] Waiting for page to load and clicking apply buttons...")
+            await bot.page.wait_for_load_state('domcontentloaded')
+            
+            try:
+                apply_button = await bot.page.query_selector('a[data-automation-id="adventureButton"]')
+                if apply_button:
+                    await apply_button.click()
+                    await asyncio.sleep(1)
+                apply_manually_button = await bot.page.query_selector('a[data-automation-id="applyManually"]')
+                if apply_manually_button:
+                    await apply_manually_button.click()
+                    await asyncio.sleep(0.5)
+
                 await bot.page.wait_for_load_state('networkidle')
-                await asyncio.sleep(0.5)
-                
-                try:
-                    apply_button = await bot.page.query_selector('a[data-automation-id="adventureButton"]')
-                    if apply_button:
-                        await apply_button.click()
-                        await asyncio.sleep(1)
-                    apply_manually_button = await bot.page.query_selector('a[data-automation-id="applyManually"]')
-                    if apply_manually_button:
-                        await apply_manually_button.click()
-                        await asyncio.sleep(0.5)
-
-                    await bot.page.wait_for_load_state('networkidle')
-                except Exception as e:
-                    print(f"[App {application_index + 1}] Apply buttons not found or already on application page: {e}")
-
-                # Handle authentication (sign up only)
+            except Exception as e:
+                print(f"[App {application_index + 1}] Apply buttons not found or already on application page: {e}")
+
+            # Handle authentication (sign up only), unless a restored session is already signed in
+            if await bot.is_signed_in():
+                print(f"[App {application_index + 1}] Restored session is already signed in, skipping authentication")
+            else:
                 print(f"[App {application_index + 1}] Handling authentication (sign up)...")
                 auth_success = await bot.handle_authentication(2)  # 2 for sign up
                 if not auth_success:
@@ -95,79 +103,78 @@ async def process_single_application(url, semaphore, application_index):
 
                 print(f"[App {application_index + 1}] Authentication successful!")
 
-                await asyncio.sleep(10)  # Wait for page to load after authentication
-
-                # Process the first page sections
-                print(f"[App {application_index + 1}] Processing initial application sections...")
-                success = await process_application_sections(bot, application_index + 1)
-
-                await asyncio.sleep(5)  # Wait for personal info section to process
+            await bot._wait_for_page_ready(timeout=30000)  # Wait for the form to render after authentication
+
+            # Process the first page sections
+            print(f"[App {application_index + 1}] Processing initial application sections...")
+            success = await process_application_sections(bot, application_index + 1)
+
+            await bot._wait_for_page_ready()  # Wait for personal info section to process
+
+            if not success:
+                print(f"[App {application_index + 1}] Failed to process initial sections")
+                return False, False
+
+            # Click the first Next button
+            print(f"[App {application_index + 1}] Looking for first Next button...")
+            try:
+                next_button = await bot.page.wait_for_selector(
+                    'button[data-automation-id="pageFooterNextButton"]',
+                    state='visible', timeout=15000
+                )
+            except PlaywrightTimeoutError:
+                next_button = None
+            if next_button:
+                print(f"[App {application_index + 1}] Clicking first Next button...")
+                await bot._click_and_wait_for_submit(next_button)
+            else:
+                print(f"[App {application_index + 1}] No Next button found on first page")
 
-                if not success:
-                    print(f"[App {application_index + 1}] Failed to process initial sections")
-                    return False, False
+            # Process remaining pages
+            print(f"[App {application_index + 1}] Processing remaining application pages...")
+            was_submitted = await process_remaining_pages(bot, application_index + 1)
 
-                # Click the first Next button
-                print(f"[App {application_index + 1}] Looking for first Next button...")
-                next_button = await bot.page.query_selector('button[data-automation-id="pageFooterNextButton"]')
-                if next_button:
-                    print(f"[App {application_index + 1}] Clicking first Next button...")
-                    await next_button.click()
-                    await asyncio.sleep(5)
-                else:
-                    print(f"[App {application_index + 1}] No Next button found on first page")
-
-                # Process remaining pages
-                print(f"[App {application_index + 1}] Processing remaining application pages...")
-                was_submitted = await process_remaining_pages(bot, application_index + 1)
-
-                # Save application data to JSON
-                print(f"[App {application_index + 1}] Saving application data...")
-                saved_file = bot.save_application_data()
-                if saved_file:
-                    print(f"[App {application_index + 1}] Application data successfully saved to: {saved_file}")
-                    
-                    # Print timing summary for this application
-                    timing_summary = bot.get_timing_summary()
-                    if timing_summary['total_questions'] > 0:
-                        print(f"[App {application_index + 1}] Timing Summary:")
-                        print(f"[App {application_index + 1}]   - Questions processed: {timing_summary['total_questions']}")
-                        print(f"[App {application_index + 1}]   - Total time: {timing_summary['total_time_readable']}")
-                        print(f"[App {application_index + 1}]   - Average per question: {timing_summary['average_time_readable']}")
-                        print(f"[App {application_index + 1}]   - Fastest: {timing_summary['fastest_question_ms']/1000:.2f}s")
-                        print(f"[App {application_index + 1}]   - Slowest: {timing_summary['slowest_question_ms']/1000:.2f}s")
-
-                if was_submitted:
-                    print(f"\n=== Application {application_index + 1} SUBMITTED Successfully ===")
-                else:
-                    print(f"\n=== Application {application_index + 1} Completed (No Submission) ===")
+            # Save application data to JSON
+            print(f"[App {application_index + 1}] Saving application data...")
+            saved_file = bot.save_application_data()
+            if saved_file:
+                print(f"[App {application_index + 1}] Application data successfully saved to: {saved_file}")
                 
-                return True, was_submitted
+                # Print timing summary for this application
+                timing_summary = bot.get_timing_summary()
+                if timing_summary['total_questions'] > 0:
+                    print(f"[App {application_index + 1}] Timing Summary:")
+                    print(f"[App {application_index + 1}]   - Questions processed: {timing_summary['total_questions']}")
+                    print(f"[App {application_index + 1}]   - Total time: {timing_summary['total_time_readable']}")
+                    print(f"[App {application_index + 1}]   - Average per question: {timing_summary['average_time_readable']}")
+                    print(f"[App {application_index + 1}]   - Fastest: {timing_summary['fastest_question_ms']/1000:.2f}s")
+                    print(f"[App {application_index + 1}]   - Slowest: {timing_summary['slowest_question_ms']/1000:.2f}s")
 
-        except asyncio.TimeoutError:
-            print(f"[App {application_index + 1}] TIMEOUT: Application exceeded 15-minute limit - terminating")
-            return False, False
+            if was_submitted:
+                print(f"\n=== Application {application_index + 1} SUBMITTED Successfully ===")
+            else:
+                print(f"\n=== Application {application_index + 1} Completed (No Submission) ===")
             
-        except Exception as e:
-            print(f"[App {application_index + 1}] Error during job application process: {str(e)}")
-            import traceback
-            print(f"[App {application_index + 1}] Full traceback: {traceback.format_exc()}")
-            return False, False
+            return True, was_submitted
+
+    except asyncio.TimeoutError:
+        print(f"[App {application_index + 1}] TIMEOUT: Application exceeded 15-minute limit - terminating")
+        return False, False
         
-        finally:
-            # Clean up browser resources
-            if bot.browser:
-                print(f"[App {application_index + 1}] Cleaning up browser resources...")
-                try:
-                    await bot.browser.close()
-                except:
-                    pass  # Ignore cleanup errors
+    except Exception as e:
+        print(f"[App {application_index + 1}] Error during job application process: {str(e)}")
+        import traceback
+        print(f"[App {application_index + 1}] Full traceback: {traceback.format_exc()}")
+        return False, False
 
 
 async def process_application_sections(bot, app_num):
     """Process all sections on the current application page"""
-    await asyncio.sleep(10)
-    main_page = await bot.page.query_selector('div[data-automation-id="applyFlowPage"]')
+    # Returns as soon as the apply flow renders instead of after a fixed 10s
+    try:
+        main_page = await bot.page.wait_for_selector('div[data-automation-id="applyFlowPage"]', timeout=30000)
+    except PlaywrightTimeoutError:
+        main_page = None
     
     if not main_page:
         print(f"[App {app_num}] Main page container not found")
@@ -177,37 +184,25 @@ async def process_application_sections(bot, app_num):
 
     await bot._process_personal_information_section(main_page)
 
-    await bot.page.wait_for_load_state('networkidle') 
-    await asyncio.sleep(5)  # Wait for personal info section to process
+    await bot._wait_for_page_ready()  # Wait for personal info section to process
 
-    # Find all sections in the application
-    sections = await main_page.query_selector_all('div[role="group"][aria-labelledby]')
+    # Find all sections in the application; their labels come back in the same evaluate
+    # and are cached on each section so repeated attribute reads by the processors stay local
+    sections, labels = await bot._query_sections(main_page)
     print(f"[App {app_num}] Found {len(sections)} sections to process")
-    
-    for section in sections:
-        aria_labelledby = await section.get_attribute('aria-labelledby')
+
+    for section, aria_labelledby in zip(sections, labels):
         if not aria_labelledby:
             continue
 
         print(f"[App {app_num}] Processing section: {aria_labelledby}")
 
-        if any(keyword in aria_labelledby.lower() for keyword in ["work", "experience", "history"]):
-            print(f"[App {app_num}] Processing work experience section")
-            await bot._process_experience_section(section)
-        elif any(keyword in aria_labelledby.lower() for keyword in ["education"]):
-            print(f"[App {app_num}] Processing education section")
-            await bot._process_education_section(section)
-        elif any(keyword in aria_labelledby.lower() for keyword in ["language"]):
-            print(f"[App {app_num}] Processing language section")
-            await bot._process_language_section(section)
-        elif any(keyword in aria_labelledby.lower() for keyword in ["skill"]):
-            print(f"[App {app_num}] Processing skills section")
-            await bot._process_skills_section(section)
-        elif any(keyword in aria_labelledby.lower() for keyword in ["resume", "document"]):
-            print(f"[App {app_num}] Processing resume section")
-            await bot._process_resume_section(section)
-        elif any(keyword in aria_labelledby.lower() for keyword in ["website", "portfolio"]):
-            continue  # Skip website/portfolio sections for now
+        label_lower = aria_labelledby.lower()
+        matched, method = _DISPATCH.match(label_lower)
+        if matched:
+            if method:
+                print(f"[App {app_num}] Dispatching section to {method}")
+                await getattr(bot, method)(section)
         else:
             print(f"[App {app_num}] Unknown section type: {aria_labelledby}")
             await bot._process_generic_section(section, aria_labelledby)
@@ -217,33 +212,31 @@ async def process_application_sections(bot, app_num):
 
 async def process_remaining_pages(bot, app_num):
     """Process remaining application pages until no more Next buttons are found"""
-    page_count = 1
     was_submitted = False
     
-    while True:
+    for page_count in itertools.count(1):
         print(f"[App {app_num}] Processing Page {page_count}")
         
+        # Process sections on the new page
+        await bot._wait_for_page_ready()
         try:
-            # Process sections on the new page
-            await asyncio.sleep(5)
             await bot._process_later_sections(bot.page)
-            
-            page_count += 1
-            
-            next_button = await bot.page.query_selector('button[data-automation-id="pageFooterNextButton"]')
-            
-            if not next_button:
-                print(f"[App {app_num}] No Next button found - reached the end of the application")
-                break
-            
-            # Check if the button is visible and enabled
-            is_visible = await next_button.is_visible()
-            
-            if not is_visible:
-                print(f"[App {app_num}] Next button found but not clickable - reached the end of the application")
-                break
-            
-            print(f"[App {app_num}] Next button found, clicking to proceed to next page...")
+        except Exception as e:
+            print(f"[App {app_num}] Error processing page {page_count}: {str(e)}")
+            break
+        
+        # Returns as soon as the button is visible; a short timeout means the flow has ended
+        try:
+            next_button = await bot.page.wait_for_selector(
+                'button[data-automation-id="pageFooterNextButton"]',
+                state='visible', timeout=3000
+            )
+        except PlaywrightTimeoutError:
+            print(f"[App {app_num}] No visible Next button found - reached the end of the application")
+            break
+        
+        print(f"[App {app_num}] Next button found, clicking to proceed to next page...")
+        try:
             # Check if text content of next button indicates submission
             next_button_text = await next_button.text_content()
             if next_button_text and "submit" in next_button_text.lower():
@@ -252,22 +245,43 @@ async def process_remaining_pages(bot, app_num):
             else:
                 print(f"[App {app_num}] Next button text: {next_button_text.strip() if next_button_text else 'No text content'}")
             
-            await next_button.click()
-            
-            # If this was a submit button, break after clicking
-            if was_submitted:
-                await asyncio.sleep(3)  # Wait for submission to complete
-                print(f"[App {app_num}] 🎉 APPLICATION SUBMITTED SUCCESSFULLY!")
-                break
-                        
-        except Exception as e:
-            print(f"[App {app_num}] Error processing page {page_count}: {str(e)}")
+            await bot._click_and_wait_for_submit(next_button)
+        except PlaywrightError as e:
+            print(f"[App {app_num}] Error clicking Next on page {page_count}: {str(e)}")
+            break
+        
+        # If this was a submit button, stop after clicking
+        if was_submitted:
+            print(f"[App {app_num}] 🎉 APPLICATION SUBMITTED SUCCESSFULLY!")
             break
     
     print(f"[App {app_num}] Completed processing {page_count} pages total")
     return was_submitted
 
 
+def record_result(result) -> None:
+    """Count one finished application in GLOBAL_STATS and print the running totals"""
+    GLOBAL_STATS['total_processed'] += 1
+    
+    if isinstance(result, Exception):
+        GLOBAL_STATS['failed_applications'] += 1
+        print(f"Application failed with exception: {result}")
+    elif isinstance(result, tuple) and len(result) == 2:
+        success, was_submitted = result
+        if success:
+            GLOBAL_STATS['successful_applications'] += 1
+            if was_submitted:
+                GLOBAL_STATS['submitted_applications'] += 1
+        else:
+            GLOBAL_STATS['failed_applications'] += 1
+    else:
+        GLOBAL_STATS['failed_applications'] += 1
+    
+    print(f"Current stats - Submitted: {GLOBAL_STATS['submitted_applications']}, "
+          f"Failed: {GLOBAL_STATS['failed_applications']}, "
+          f"Total: {GLOBAL_STATS['total_processed']}")
+
+
 async def main():
     """Main function to run batch job applications"""
     
@@ -322,56 +336,34 @@ async def main():
     print(f"Starting from job {start_index + 1}")
     print(f"Press Ctrl+C anytime to stop and see statistics")
     
-    # Create semaphore to limit concurrent applications
-    semaphore = asyncio.Semaphore(concurrent_apps)
+    # One shared browser; each application gets its own context, bounded by the pool's semaphore
+    pool = JobApplicationBotPool(max_concurrency=concurrent_apps, headless="--headed" not in sys.argv,
+                                cache_path=".ai_cache")
     
-    # Process jobs in batches
-    batch_size = concurrent_apps
+    # Jobs as (company, url, application_index); the pool's semaphore refills a slot as soon as
+    # any application finishes, instead of waiting for the slowest one of a fixed batch
+    jobs = [
+        (f"batch_job_{start_index + j + 1}", url, start_index + j)
+        for j, url in enumerate(selected_jobs)
+    ]
+    
+    async def run_and_record(bot, url, application_index):
+        try:
+            result = await process_single_application(bot, url, application_index)
+        except Exception as e:
+            record_result(e)
+            return False, False
+        record_result(result)
+        return result
     
     try:
-        for i in range(0, len(selected_jobs), batch_size):
-            batch = selected_jobs[i:i + batch_size]
-            batch_start_index = start_index + i
-            
-            print(f"\n--- Processing Batch {i//batch_size + 1} ---")
-            print(f"Jobs {batch_start_index + 1} to {batch_start_index + len(batch)}")
-            
-            # Create tasks for this batch
-            tasks = [
-                process_single_application(url, semaphore, batch_start_index + j)
-                for j, url in enumerate(batch)
-            ]
-            
-            # Run batch concurrently
-            results = await asyncio.gather(*tasks, return_exceptions=True)
-            
-            # Count results
-            for result in results:
-                GLOBAL_STATS['total_processed'] += 1
-                
-                if isinstance(result, Exception):
-                    GLOBAL_STATS['failed_applications'] += 1
-                    print(f"Application failed with exception: {result}")
-                elif isinstance(result, tuple) and len(result) == 2:
-                    success, was_submitted = result
-                    if success:
-                        GLOBAL_STATS['successful_applications'] += 1
-                        if was_submitted:
-                            GLOBAL_STATS['submitted_applications'] += 1
-                    else:
-                        GLOBAL_STATS['failed_applications'] += 1
-                else:
-                    GLOBAL_STATS['failed_applications'] += 1
-            
-            print(f"Batch {i//batch_size + 1} completed")
-            print(f"Current stats - Submitted: {GLOBAL_STATS['submitted_applications']}, "
-                  f"Failed: {GLOBAL_STATS['failed_applications']}, "
-                  f"Total: {GLOBAL_STATS['total_processed']}")
-            
-            # Small delay between batches
-            if i + batch_size < len(selected_jobs):
-                print("Waiting 5 seconds before next batch...")
-                await asyncio.sleep(5)
+        await pool.start()
+        results = await pool.run_all(jobs, run_and_record)
+        # run_and_record never raises, so exceptions here come from the pool opening a
+        # context/page for the job; count those applications as failed too
+        for result in results:
+            if isinstance(result, Exception):
+                record_result(result)
     
     except KeyboardInterrupt:
         print(f"\n\nBatch process interrupted by user.")
@@ -380,9 +372,13 @@ async def main():
         print(f"\n\nUnexpected error in batch process: {e}")
     
     finally:
+        await pool.close()
         print_final_stats()
 
 
 if __name__ == "__main__":
+    # Per-element form diagnostics are DEBUG; pass --verbose to see them
+    logging.basicConfig(format="%(message)s")
+    logging.getLogger("final").setLevel(logging.DEBUG if "--verbose" in sys.argv else logging.INFO)
     # Run the main function
     asyncio.run(main())
@@ -10,55 +10,456 @@ Version: 2.0
 """
 
 import asyncio
+import atexit
+import functools
+import hashlib
 import json
+import logging
 import os
 import random
-from typing import Dict, List, Any, Optional, Tuple
+import re
+import shelve
+from typing import Dict, List, Any, Optional, Tuple, Callable, Awaitable
 from datetime import datetime
 from datetime import date
 from pathlib import Path
+from types import MappingProxyType
 
 import openai
-from playwright.async_api import async_playwright, Page, Browser, BrowserContext
+import orjson
+from playwright.async_api import async_playwright, Page, Browser, BrowserContext, Locator
+from playwright.async_api import Error as PlaywrightError, TimeoutError as PlaywrightTimeoutError
 from dotenv import load_dotenv
 
-from ai_handler import AIResponseHandler
+from ai_handler import AIResponseHandler, field_key
+
+# Per-element diagnostics from the form loops; entry points decide the level (--verbose for DEBUG)
+log = logging.getLogger(__name__)
+
+
+# Skip GPU/extension initialisation and /dev/shm allocation; hide the automation flag from sites
+CHROMIUM_ARGS = [
+    '--disable-blink-features=AutomationControlled',
+    '--disable-dev-shm-usage',
+    '--no-sandbox',
+    '--disable-gpu',
+    '--disable-extensions',
+    '--no-first-run',
+]
+
+
+# Resolved listbox options of section schemas persisted across runs (opt-in), one shelf per path
+# (dbm allows a single writer)
+_SCHEMA_CACHES: Dict[str, shelve.Shelf] = {}
+
+
+def _open_schema_cache(path: str) -> shelve.Shelf:
+    """Open (once per process) the on-disk section schema cache at path"""
+    if path not in _SCHEMA_CACHES:
+        cache = shelve.open(path, writeback=False)
+        atexit.register(cache.close)
+        _SCHEMA_CACHES[path] = cache
+    return _SCHEMA_CACHES[path]
+
+
+@functools.lru_cache(maxsize=8)
+def _load_profile_cached(path: str, mtime: float) -> Dict[str, Any]:
+    """Parse a user profile file once per (path, mtime) so edits invalidate the cache"""
+    with open(path, 'rb') as f:
+        return orjson.loads(f.read())
+
+
+# Reads everything the form loops need about each input in a single CDP round-trip.
+# Called with a null selector it describes one element; _read_labels uses that for single lookups.
+_INPUT_SNAPSHOT_JS = '''
+(root, selector) => {
+    const text = node => (node && node.textContent) ? node.textContent.trim() : null;
+    const clean = value => value ? value.replace(/\\*/g, '').trim() : null;
+
+    const nearestLabel = el => {
+        let cur = el.parentElement;
+        for (let depth = 0; cur && depth < 10; depth++, cur = cur.parentElement) {
+            if (cur.tagName.toLowerCase() === "div" &&
+                cur.getAttribute("data-automation-id")?.startsWith("formField-")) {
+                const found = text(cur.querySelector("label"));
+                if (found) return clean(found);
+            }
+        }
+        if (el.id && el.id !== "unknown") {
+            const container = el.closest('[data-automation-id^="formField-"]');
+            for (const label of document.querySelectorAll(`label[for="${CSS.escape(el.id)}"]`)) {
+                const found = text(label);
+                if (container && label.closest('[data-automation-id^="formField-"]') === container && found) {
+                    return clean(found);
+                }
+            }
+        }
+        const parentLabel = text(el.closest("label"));
+        if (parentLabel) return clean(parentLabel);
+        const labelledby = el.getAttribute("aria-labelledby");
+        if (labelledby) {
+            const found = text(document.getElementById(labelledby));
+            if (found) return clean(found);
+        }
+        const fieldset = el.closest("fieldset");
+        const legend = fieldset ? text(fieldset.querySelector("legend")) : null;
+        if (legend) return clean(legend);
+        return clean(el.getAttribute("aria-label")) || clean(el.getAttribute("placeholder")) || null;
+    };
+
+    const groupLabel = el => {
+        let label_text = null;
+        let aria_labelledby = null;
+        const group = el.closest("fieldset, [role='group']");
+        if (group) {
+            label_text = text(group.querySelector("legend"));
+            const labelledby = group.getAttribute("aria-labelledby");
+            if (labelledby) {
+                aria_labelledby = labelledby;
+                label_text = text(document.getElementById(labelledby)) || label_text;
+            }
+            if (!label_text) label_text = text(group.querySelector("label"));
+        }
+        if (!label_text) {
+            let cur = el.parentElement;
+            for (let depth = 0; cur && depth < 15; depth++, cur = cur.parentElement) {
+                const labelledby = cur.getAttribute && cur.getAttribute("aria-labelledby");
+                if (labelledby) {
+                    aria_labelledby = labelledby;
+                    label_text = text(document.getElementById(labelledby));
+                    if (label_text) break;
+                }
+            }
+        }
+        return {label_text, aria_labelledby};
+    };
+
+    // Radio buttons: the question of the whole group, and this option's own label
+    const radioQuestion = el => {
+        const group = el.closest("fieldset, [role='group']");
+        if (!group) return null;
+        const legend = text(group.querySelector("legend"));
+        if (legend) return legend;
+        const labelledby = group.getAttribute("aria-labelledby");
+        const byId = labelledby ? text(document.getElementById(labelledby)) : null;
+        if (byId) return byId;
+        // Labels tied to an input with for= are option labels, not the question
+        for (const label of group.querySelectorAll("label")) {
+            const found = !label.getAttribute("for") && text(label);
+            if (found) return found;
+        }
+        return null;
+    };
+
+    const optionLabel = el => {
+        if (el.id) {
+            const label = document.querySelector(`label[for="${CSS.escape(el.id)}"]`);
+            const found = label && label.innerText ? label.innerText.trim() : null;
+            if (found) return found;
+        }
+        for (let cur = el.parentElement, depth = 0; cur && depth < 2; depth++, cur = cur.parentElement) {
+            const found = text(cur.querySelector("label:not([id])"));
+            if (found) return found;
+        }
+        for (const sibling of [el.nextElementSibling, el.previousElementSibling]) {
+            const found = text(sibling);
+            if (found && found.length < 50) return found;
+        }
+        const value = el.getAttribute("value");
+        if (value && value !== "on") {
+            if (value.toLowerCase() === "true") return "Yes";
+            if (value.toLowerCase() === "false") return "No";
+            return value;
+        }
+        return "Unknown Option";
+    };
+
+    // Inside a multi-select container (skills, "how did you hear"), within ten ancestors
+    const inMultiSelect = el => {
+        let cur = el.parentElement;
+        for (let depth = 0; cur && depth < 10; depth++, cur = cur.parentElement) {
+            if (cur.getAttribute("data-automation-id")?.includes("multiSelectContainer")) return true;
+        }
+        return false;
+    };
+
+    // Options already in the DOM: <select> children, or a listbox the element controls.
+    // Workday's popup listboxes only render on click, so those come back null and get read the slow way.
+    const domOptions = el => {
+        if (el.tagName === "SELECT") {
+            return Array.from(el.options, option => option.textContent.trim()).filter(Boolean);
+        }
+        const controls = el.getAttribute("aria-haspopup") && el.getAttribute("aria-controls");
+        const listbox = controls ? document.getElementById(controls) : null;
+        if (!listbox) return null;
+        const options = Array.from(listbox.querySelectorAll('[role="option"]'), option => text(option)).filter(Boolean);
+        return options.length ? options : null;
+    };
+
+    // A null selector describes the root element itself
+    return Array.from(selector ? root.querySelectorAll(selector) : [root], el => {
+        const group = groupLabel(el);
+        return {
+            input_id: el.getAttribute("data-automation-id") || el.getAttribute("aria-haspopup") || "unknown",
+            input_type: el.getAttribute("type") || "unknown",
+            element_id: el.getAttribute("id") || "unknown",
+            input_tag: el.tagName.toLowerCase(),
+            role: el.getAttribute("role"),
+            placeholder: el.getAttribute("placeholder"),
+            required: el.getAttribute("required"),
+            aria_required: el.getAttribute("aria-required"),
+            dir: el.getAttribute("dir"),
+            aria_haspopup: el.getAttribute("aria-haspopup"),
+            options: domOptions(el),
+            multi_select: inMultiSelect(el),
+            question: nearestLabel(el),
+            group_label: group.label_text,
+            name: el.getAttribute("name"),
+            radio_question: el.type === "radio" ? radioQuestion(el) : null,
+            option_label: el.type === "radio" ? optionLabel(el) : null,
+            aria_labelledby: group.aria_labelledby,
+        };
+    });
+}
+'''
+
+
+# Sets each listed input that exists and is empty, through the native value setter plus input/change
+# events so Workday's React state sees the change; returns the [id, value] pairs it filled
+_FILL_EMPTY_INPUTS_JS = '''
+(fieldValues) => {
+    const setValue = Object.getOwnPropertyDescriptor(HTMLInputElement.prototype, "value").set;
+    const filled = [];
+    for (const [id, value] of fieldValues) {
+        const el = document.getElementById(id);
+        if (!el || el.value) continue;
+        setValue.call(el, value);
+        el.dispatchEvent(new Event("input", {bubbles: true}));
+        el.dispatchEvent(new Event("change", {bubbles: true}));
+        filled.push([id, value]);
+    }
+    return filled;
+}
+'''
+
+
+# Date parts Workday splits its date inputs into
+DATE_PARTS = ("day", "month", "year")
+
+# Disability self-identification sign-off date inputs and the date part each one takes
+DISABILITY_DATE_FIELDS = (
+    ("selfIdentifiedDisabilityData--dateSignedOn-dateSectionMonth-input", "month"),
+    ("selfIdentifiedDisabilityData--dateSignedOn-dateSectionDay-input", "day"),
+    ("selfIdentifiedDisabilityData--dateSignedOn-dateSectionYear-input", "year"),
+)
+
+
+# Leaf options of Workday's multi-select prompt, and options of an open listbox popup
+PROMPT_OPTION_SELECTOR = 'div[data-automation-id="promptLeafNode"]'
+OPEN_LISTBOX_SELECTOR = 'div[visibility="opened"]'
+OPEN_LISTBOX_OPTION_SELECTOR = 'div[visibility="opened"] li'
+
+# Content of the current apply-flow step; the applyFlowPage container itself survives navigation,
+# so a step change is detected by this content detaching
+PAGE_CONTENT_SELECTOR = ('[data-automation-id="applyFlowPage"] [role="group"][aria-labelledby], '
+                         '[data-automation-id="applyFlowPage"] h2')
+
+# Navigation controls the form loops never fill
+SKIP_INPUT_IDS = frozenset({"pageFooterBackButton", "backToJobPosting"})
+
+# Most element extractions allowed in flight at once over the page's CDP connection
+EXTRACT_CONCURRENCY = 16
+
+
+def _match_option_index(options: List[str], response: str) -> int:
+    """Index of the option matching response: exact (case/space-insensitive) first, then substring; -1 if none"""
+    options_lc = [option.lower().strip() for option in options]
+    response_lc = response.lower().strip()
+    # Reversed so the first option wins on duplicate labels
+    exact = {option_lc: i for i, option_lc in reversed(list(enumerate(options_lc)))}
+    if response_lc in exact:
+        return exact[response_lc]
+    for i, option_lc in enumerate(options_lc):
+        if response_lc in option_lc or option_lc in response_lc:
+            return i
+    return -1
+
+
+def _fillable_inputs(inputs: List[Any], infos: List[Dict[str, Any]]) -> List[Tuple[Any, Dict[str, Any]]]:
+    """Pair handles with their snapshot records, dropping navigation controls"""
+    return [(input_el, info) for input_el, info in zip(inputs, infos) if info['input_id'] not in SKIP_INPUT_IDS]
+
+
+def _field_input_type(info: Dict[str, Any]) -> str:
+    """The input_type a field is filled as: spinbutton role first, then textarea tag, else the type attribute"""
+    if info['role'] == "spinbutton":
+        return "spinbutton"
+    if info['input_tag'] == 'textarea':
+        return 'textarea'
+    return info['input_type']
+
+
+def _today_date_parts() -> Dict[str, str]:
+    """Today's date as the zero-padded strings Workday's date inputs expect"""
+    today = date.today()
+    return {"day": f"{today.day:02d}", "month": f"{today.month:02d}", "year": str(today.year)}
+
+
+@functools.lru_cache(maxsize=8)
+def _resume_size_cached(path: str, mtime: float) -> int:
+    """Size of a resume file, cached per (path, mtime) so a replaced file is re-read"""
+    return os.path.getsize(path)
+
+
+def _validate_resume(path: str) -> Tuple[bool, int]:
+    """Return (exists, size in bytes) for a resume file; missing files are never cached"""
+    try:
+        return True, _resume_size_cached(path, os.path.getmtime(path))
+    except OSError:
+        return False, 0
+
+
+def _write_json(filepath: Path, data: Any) -> None:
+    """Write data as indented UTF-8 JSON, falling back to stdlib json if orjson rejects it
+    
+    The fallback streams encoder chunks to the file instead of building one large string.
+    """
+    try:
+        payload = orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    except orjson.JSONEncodeError:
+        encoder = json.JSONEncoder(indent=2, ensure_ascii=False)
+        with open(filepath, 'w', encoding='utf-8') as f:
+            for chunk in encoder.iterencode(data):
+                f.write(chunk)
+        return
+    with open(filepath, 'wb') as f:
+        f.write(payload)
+
+
+class CachedSection:
+    """ElementHandle wrapper that memoizes get_attribute reads for the section's lifetime
+    
+    Method calls (query_selector_all, click, ...) are forwarded to the wrapped handle. The wrapper
+    itself is not a JSHandle: wherever a section is passed *to* Playwright (an evaluate argument,
+    a wait_for_function arg, ...) pass .handle instead, e.g. via _element_handle().
+    """
+    __slots__ = ('handle', '_attrs')
+    
+    def __init__(self, handle, attrs: Optional[Dict[str, Optional[str]]] = None):
+        """Wrap handle; attrs seeds attribute values already read (e.g. in a batched evaluate)"""
+        self.handle = handle
+        self._attrs: Dict[str, Optional[str]] = dict(attrs or {})
+    
+    async def get_attribute(self, name: str) -> Optional[str]:
+        if name not in self._attrs:
+            self._attrs[name] = await self.handle.get_attribute(name)
+        return self._attrs[name]
+    
+    def __getattr__(self, name):
+        return getattr(self.handle, name)
+
+
+def _element_handle(element):
+    """The raw ElementHandle behind a CachedSection; any other element is returned as is"""
+    return element.handle if isinstance(element, CachedSection) else element
+
+
+class SectionDispatch:
+    """Keyword table for section processors, matched against a label with one precompiled regex
+    
+    The table is a list of (keywords, processor) entries; when a label contains keywords of
+    several entries, the earliest entry wins, as with a first-match scan of the table.
+    """
+    __slots__ = ('_handlers', '_pattern')
+    
+    def __init__(self, table: List[Tuple[Tuple[str, ...], Optional[str]]]):
+        self._handlers: Dict[str, Tuple[int, Optional[str]]] = {}
+        for priority, (keywords, processor) in enumerate(table):
+            for keyword in keywords:
+                self._handlers.setdefault(keyword, (priority, processor))
+        # Longest first so a keyword that contains another still matches as itself
+        self._pattern = re.compile('|'.join(map(re.escape, sorted(self._handlers, key=len, reverse=True))))
+    
+    def match(self, label_lower: str) -> Tuple[bool, Optional[str]]:
+        """(whether any entry matched, its processor) for an already lower-cased label"""
+        hits = [self._handlers[keyword] for keyword in self._pattern.findall(label_lower)]
+        if not hits:
+            return False, None
+        return True, min(hits, key=lambda hit: hit[0])[1]
+
+
+class LeveledBatch:
+    """Queue coroutine factories by level and run the levels in ascending order
+    
+    Every coroutine in a level finishes before the next level starts. Within a level they run
+    concurrently through asyncio.gather, except for levels listed in serial_levels, which run
+    one at a time in the order they were added.
+    """
+    
+    def __init__(self, serial_levels: Tuple[int, ...] = ()):
+        self.serial_levels = set(serial_levels)
+        self._levels: Dict[int, List[Callable[[], Awaitable[Any]]]] = {}
+    
+    def add(self, level: int, coro_factory: Callable[[], Awaitable[Any]]) -> None:
+        self._levels.setdefault(level, []).append(coro_factory)
+    
+    def __len__(self) -> int:
+        return sum(len(factories) for factories in self._levels.values())
+    
+    async def run(self) -> Dict[int, List[Any]]:
+        """Run all queued levels and return each level's results in insertion order"""
+        results = {}
+        for level in sorted(self._levels):
+            factories = self._levels[level]
+            if level in self.serial_levels:
+                results[level] = [await factory() for factory in factories]
+            else:
+                results[level] = list(await asyncio.gather(*(factory() for factory in factories)))
+        self._levels.clear()
+        return results
+
 
 class JobApplicationBot:
     """Main class for job application automation"""
     
-    def __init__(self, config_path: str = "data/user_profile_temp.json"):
+    # Application URLs for different companies, built once and shared read-only by all bots
+    COMPANY_URLS = MappingProxyType({
+        "nvidia": "https://nvidia.wd5.myworkdayjobs.com/en-US/NVIDIAExternalCareerSite/job/US%2C-CA%2C-Santa-Clara/Senior-AI-and-ML-Engineer---AI-for-Networking_JR2000376/apply/applyManually?q=ml+enginer",
+        "salesforce": "https://salesforce.wd12.myworkdayjobs.com/en-US/External_Career_Site/job/Singapore---Singapore/Senior-Manager--Solution-Engineering--Philippines-_JR301876/apply/applyManually",
+        "hitachi": "https://hitachi.wd1.myworkdayjobs.com/en-US/hitachi/job/Alamo%2C-Tennessee%2C-United-States-of-America/Project-Engineer_R0102918/apply/applyManually",
+        "icf": "https://icf.wd5.myworkdayjobs.com/en-US/ICFExternal_Career_Site/job/Reston%2C-VA/Senior-Paid-Search-Manager_R2502057/apply/applyManually",
+        "harris": "https://harriscomputer.wd3.myworkdayjobs.com/en-US/1/job/Florida%2C-United-States/Vice-President-of-Sales_R0030918/apply/applyManually",
+        "walmart": "https://walmart.wd5.myworkdayjobs.com/en-US/WalmartExternal/job/Sherbrooke%2C-QC/XMLNAME--CAN--Self-Checkout-Attendant_R-2263567-1/apply/applyManually"
+    })
+    
+    def __init__(self, config_path: str = "data/user_profile_temp.json", schema_cache_path: Optional[str] = None,
+                 cache_path: Optional[str] = None):
         """Initialize the job application bot
         
         Args:
             config_path: Path to user profile configuration file
+            schema_cache_path: Shelf persisting resolved listbox options across runs; None disables it
+            cache_path: Shelf persisting AI answers across runs (e.g. ".ai_cache"); None disables it
         """
         load_dotenv()
         self.config_path = config_path
         self.user_data = self._load_user_profile()
         self.client = openai.AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-        self.ai_handler = AIResponseHandler(self.client)  # Initialize AI handler
+        self.ai_handler = AIResponseHandler(self.client, cache_path=cache_path)  # Initialize AI handler
         self.browser: Optional[Browser] = None
         self.context: Optional[BrowserContext] = None
         self.page: Optional[Page] = None
         self.company: str = "unknown"  # Track current company
+        self.authenticated = False  # Set once sign up/sign in succeeds
+        self.storage_state_path: Optional[Path] = None  # Where the session is persisted on close
         
-        # Application URLs for different companies
-        self.company_urls = {
-            "nvidia": "https://nvidia.wd5.myworkdayjobs.com/en-US/NVIDIAExternalCareerSite/job/US%2C-CA%2C-Santa-Clara/Senior-AI-and-ML-Engineer---AI-for-Networking_JR2000376/apply/applyManually?q=ml+enginer",
-            "salesforce": "https://salesforce.wd12.myworkdayjobs.com/en-US/External_Career_Site/job/Singapore---Singapore/Senior-Manager--Solution-Engineering--Philippines-_JR301876/apply/applyManually",
-            "hitachi": "https://hitachi.wd1.myworkdayjobs.com/en-US/hitachi/job/Alamo%2C-Tennessee%2C-United-States-of-America/Project-Engineer_R0102918/apply/applyManually",
-            "icf": "https://icf.wd5.myworkdayjobs.com/en-US/ICFExternal_Career_Site/job/Reston%2C-VA/Senior-Paid-Search-Manager_R2502057/apply/applyManually",
-            "harris": "https://harriscomputer.wd3.myworkdayjobs.com/en-US/1/job/Florida%2C-United-States/Vice-President-of-Sales_R0030918/apply/applyManually",
-            "walmart": "https://walmart.wd5.myworkdayjobs.com/en-US/WalmartExternal/job/Sherbrooke%2C-QC/XMLNAME--CAN--Self-Checkout-Attendant_R-2263567-1/apply/applyManually"
-        }
+        self.custom_urls: Dict[str, str] = {}  # Job URLs added at runtime (pasted or batch)
         
         # Logging setup with company name and incrementing counter
+        # The run directory is created lazily on first write (see current_run_dir)
         self.logs_dir = Path("logs")
-        self.logs_dir.mkdir(exist_ok=True)
-        self.run_number = self._get_next_run_number()
-        self.current_run_dir = self.logs_dir / f"run_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{self.company}_{self.run_number:03d}"
-        self.current_run_dir.mkdir(exist_ok=True)
+        self._run_number: Optional[int] = None
+        self._current_run_dir: Optional[Path] = None
         self.url = None  # Store the current job URL
         # Track the previous question and whether it was a listbox
         self.previous_question = None
@@ -68,10 +469,30 @@ class JobApplicationBot:
         self.application_data = []
         self.extracted_elements = []  # Store all extracted elements
         self.filled_elements = []     # Store elements with responses
+        self._application_log = None  # Append-only JSONL copy of the two lists, opened on first entry
+        self._previous_page_content = None  # Handle into the step a Next click left, until it detaches
         
         # Timing profiling for questions
         self.question_timings = {}  # Store timing data for each question
         self.current_question_start_times = {}  # Track when questions are first identified
+        self._clock = datetime.now  # Timing clock; tests swap in a fake one
+        
+        # Label lookups per element handle, reset at the start of each section
+        self._label_cache: Dict[Any, Optional[str]] = {}
+        self._group_cache: Dict[Any, Tuple[Optional[str], Optional[str]]] = {}
+        self._radio_question_cache: Dict[str, str] = {}  # By radio name: one question per group
+        self._info_cache: Dict[Any, Dict[str, Any]] = {}  # Full _snapshot_inputs record per handle
+        
+        # Listbox options by (element_id, input_id, aria_labelledby) from the snapshot; cleared by every
+        # fill, since a selection can change dependent listboxes (State after Country)
+        self._listbox_options_cache: Dict[Tuple[str, str, Optional[str]], List[str]] = {}
+        
+        # Resolved listbox options per page URL and section labels, kept across runs when enabled
+        self._schema_cache = _open_schema_cache(schema_cache_path) if schema_cache_path else None
+        
+        # Bounds concurrent _extract_element_info calls; listbox clicks are serialized separately
+        self._extract_semaphore = asyncio.Semaphore(EXTRACT_CONCURRENCY)
+        self._listbox_lock = asyncio.Lock()
 
     def _get_next_run_number(self) -> int:
         """Get the next run number for the current company"""
@@ -94,20 +515,39 @@ class JobApplicationBot:
         except Exception:
             return 1
 
+    def _ensure_run_dir(self) -> None:
+        """Name and create the run directory the first time something is logged"""
+        if self._current_run_dir is None:
+            self.logs_dir.mkdir(exist_ok=True)
+            self._run_number = self._get_next_run_number()
+            self._current_run_dir = self.logs_dir / f"run_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{self.company}_{self._run_number:03d}"
+            self._current_run_dir.mkdir(exist_ok=True)
+
+    @property
+    def current_run_dir(self) -> Path:
+        """Directory for this run's logs"""
+        self._ensure_run_dir()
+        return self._current_run_dir
+
+    @property
+    def run_number(self) -> int:
+        """Run number for the current company, assigned together with the run directory"""
+        self._ensure_run_dir()
+        return self._run_number
+
     def set_company(self, company: str) -> None:
         """Set the company for this application session"""
         self.company = company
-        # Recreate the run directory with the company name
-        self.run_number = self._get_next_run_number()
-        self.current_run_dir = self.logs_dir / f"run_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{self.company}_{self.run_number:03d}"
-        self.current_run_dir.mkdir(exist_ok=True)
-        print(f"Set company to {company}, run directory: {self.current_run_dir}")
+        # The run directory is named after the company, so defer it until something is logged
+        self._run_number = None
+        self._current_run_dir = None
+        print(f"Set company to {company}")
         
     def _load_user_profile(self) -> Dict[str, Any]:
         """Load user profile data from JSON file"""
         try:
-            with open(self.config_path, 'r') as f:
-                return json.load(f)
+            # Parsed profiles are shared between bots; nothing mutates user_data
+            return _load_profile_cached(self.config_path, os.path.getmtime(self.config_path))
         except FileNotFoundError:
             print(f"User profile file not found: {self.config_path}")
             return {}
@@ -119,6 +559,8 @@ class JobApplicationBot:
         """Reset the duplicate question tracking for new applications"""
         self.previous_question = None
         self.previous_was_listbox = False
+        self._reset_label_caches()
+        self._listbox_options_cache.clear()
         print("Reset duplicate question tracking")
 
     def _start_question_timing(self, question: str, question_id: str = None) -> None:
@@ -130,7 +572,7 @@ class JobApplicationBot:
         timing_key = f"{question_id}_{question}" if question_id else question
         
         if timing_key not in self.current_question_start_times:
-            start_time = datetime.now()
+            start_time = self._clock()
             self.current_question_start_times[timing_key] = start_time
             print(f"[TIMING] Question identified at {start_time.strftime('%H:%M:%S.%f')[:-3]}: {question}")
 
@@ -144,7 +586,7 @@ class JobApplicationBot:
         
         if timing_key in self.current_question_start_times:
             start_time = self.current_question_start_times[timing_key]
-            end_time = datetime.now()
+            end_time = self._clock()
             duration = end_time - start_time
             duration_ms = duration.total_seconds() * 1000
             
@@ -191,28 +633,145 @@ class JobApplicationBot:
             "timings": sorted_timings
         }
 
-    async def initialize_browser(self, headless: bool = False, slow_mo: int = 100) -> None:
-        """Initialize browser and page"""
+    def get_storage_state_path(self, company: str) -> Path:
+        """Get the file used to persist the Workday session for a company"""
+        return self.logs_dir / f"{company}_state.json"
+
+    async def initialize_browser(self, headless: bool = False, slow_mo: int = 0,
+                                 storage_state: Optional[Path] = None) -> None:
+        """Initialize browser and page
+
+        Args:
+            headless: Run Chromium without a window
+            slow_mo: Delay in milliseconds added to every Playwright action
+            storage_state: Saved session (cookies + localStorage) to restore, if the file exists
+        """
         playwright_instance = await async_playwright().start()
-        self.browser = await playwright_instance.chromium.launch(
+        self.browser = await self.launch_chromium(playwright_instance, headless, slow_mo)
+        await self.open_context(self.browser, storage_state)
+
+    @staticmethod
+    async def launch_chromium(playwright_instance, headless: bool, slow_mo: int) -> Browser:
+        """Launch the Chromium instance used for applications"""
+        return await playwright_instance.chromium.launch(
             headless=headless,
             slow_mo=slow_mo,
+            args=CHROMIUM_ARGS,
         )
-        self.context = await self.browser.new_context(
-            viewport={'width': 1280, 'height': 720}
+
+    async def open_context(self, browser: Browser, storage_state: Optional[Path] = None) -> None:
+        """Open this bot's own context and page on a (possibly shared) browser"""
+        self.storage_state_path = storage_state
+        self.context = await browser.new_context(
+            viewport={'width': 1280, 'height': 720},
+            storage_state=str(storage_state) if storage_state and storage_state.exists() else None
         )
         self.page = await self.context.new_page()
 
     async def navigate_to_job(self, company: str = "harris") -> None:
         """Navigate to job application page"""
-        if company not in self.company_urls:
-            raise ValueError(f"Company '{company}' not supported. Available: {list(self.company_urls.keys())}")
+        url = self.custom_urls.get(company) or self.COMPANY_URLS.get(company)
+        if not url:
+            available = list(self.COMPANY_URLS.keys()) + list(self.custom_urls.keys())
+            raise ValueError(f"Company '{company}' not supported. Available: {available}")
         
-        url = self.company_urls[company]
         self.url = url  # Store URL for later use
-        await self.page.goto(url, wait_until='networkidle', timeout=30000)
+        # Workday keeps XHR polling alive, so 'networkidle' tends to run into the timeout;
+        # wait for the DOM and then for the first interactive Workday element instead
+        await self.page.goto(url, wait_until='domcontentloaded', timeout=30000)
+        await self.page.wait_for_selector(
+            'button[data-automation-id], input[data-automation-id], a[data-automation-id]',
+            timeout=30000
+        )
         print(f"Navigated to {company} job application page")
 
+    async def _wait_for_page_ready(self, timeout: int = 15000) -> None:
+        """Wait until the application page has rendered its form, at most `timeout` ms per step
+
+        Replaces fixed sleeps: returns as soon as the DOM is loaded and the apply flow (or a
+        labelled section) is present, and gives up quietly once the timeout is reached.
+        After a Next click it first waits for the previous step's content to detach, since the
+        apply-flow container (and its old sections) are still on screen right after the click.
+        """
+        previous, self._previous_page_content = self._previous_page_content, None
+        if previous is not None:
+            try:
+                await self.page.wait_for_function("el => !el.isConnected", arg=previous, timeout=timeout)
+            except PlaywrightTimeoutError:
+                print(f"Previous page still shown after {timeout / 1000:.0f}s, continuing anyway")
+            except PlaywrightError:
+                pass  # Handle's document is gone along with the old page
+            try:
+                await previous.dispose()
+            except PlaywrightError:
+                pass
+        try:
+            await self.page.wait_for_load_state('domcontentloaded', timeout=timeout)
+            await self.page.wait_for_selector(
+                '[data-automation-id="applyFlowPage"], [role="group"][aria-labelledby]',
+                timeout=timeout
+            )
+        except PlaywrightTimeoutError:
+            print(f"Page not ready after {timeout / 1000:.0f}s, continuing anyway")
+
+    async def _wait_for_form_inputs(self, timeout: int = 10000) -> None:
+        """Wait until the application form shows a visible input or button"""
+        try:
+            await self.page.wait_for_selector(
+                'div[data-automation-id="applyFlowPage"] input, div[data-automation-id="applyFlowPage"] button',
+                state='visible', timeout=timeout
+            )
+        except PlaywrightTimeoutError:
+            print(f"No visible form inputs after {timeout / 1000:.0f}s, continuing anyway")
+
+    async def _wait_for_selector_quietly(self, selector: str, state: str = 'visible', timeout: int = 5000) -> bool:
+        """Wait for selector to reach state on the page; returns False instead of raising on timeout"""
+        try:
+            await self.page.wait_for_selector(selector, state=state, timeout=timeout)
+            return True
+        except PlaywrightTimeoutError:
+            return False
+
+    async def _click_and_wait_for_submit(self, button, timeout: int = 5000) -> None:
+        """Click a Next/Submit button and wait for the form-submit request it triggers
+
+        Any XHR/fetch POST after the click counts, whatever its status, so a validation
+        failure resolves right away instead of running into the timeout; a non-2xx status is
+        logged and the page is treated as not having changed. If no POST arrives within
+        `timeout` ms the flow carries on and _wait_for_page_ready watches for the step change.
+        """
+        # Remember what the current step shows so _wait_for_page_ready can wait for it to go away
+        self._previous_page_content = await self.page.query_selector(PAGE_CONTENT_SELECTOR)
+        try:
+            async with self.page.expect_response(
+                lambda r: r.request.method == 'POST' and r.request.resource_type in ('xhr', 'fetch'),
+                timeout=timeout
+            ) as response_info:
+                await button.click()
+            response = await response_info.value
+        except PlaywrightTimeoutError:
+            print(f"No form-submit response within {timeout / 1000:.0f}s, continuing anyway")
+            return
+        if not response.ok:
+            print(f"Form submit returned HTTP {response.status} ({response.url}); staying on this page")
+            if self._previous_page_content is not None:
+                await self._previous_page_content.dispose()
+                self._previous_page_content = None
+
+    async def is_signed_in(self) -> bool:
+        """Check whether a restored session already landed on the application form"""
+        try:
+            await self.page.wait_for_selector(
+                'div[data-automation-id="applyFlowPage"], input[data-automation-id="email"]',
+                timeout=10000
+            )
+            if await self.page.query_selector('input[data-automation-id="email"]'):
+                return False
+            self.authenticated = await self.page.query_selector('div[data-automation-id="applyFlowPage"]') is not None
+            return self.authenticated
+        except Exception:
+            return False
+
     async def handle_authentication(self, auth_type: int = 1) -> bool:
         """Handle authentication - tries signup first, then falls back to signin if needed.
         
@@ -236,17 +795,20 @@ class JobApplicationBot:
             if email_input and password_input:
                 # Fields are still there, try signin instead
                 print("Email and password fields still present, attempting signin...")
-                return await self._handle_signin()
+                self.authenticated = await self._handle_signin()
+                return self.authenticated
             else:
                 # Fields are gone, signup was successful
                 print("Signup appears to be successful")
+                self.authenticated = True
                 return True
                 
         except Exception as e:
             print(f"Error during authentication: {e}")
             # Fallback to signin if anything goes wrong
             try:
-                return await self._handle_signin()
+                self.authenticated = await self._handle_signin()
+                return self.authenticated
             except Exception as signin_error:
                 print(f"Error during signin fallback: {signin_error}")
                 return False
@@ -334,26 +896,31 @@ class JobApplicationBot:
             print(f"Error during signin: {e}")
             return False
 
-    async def _get_radio_group(self, main_page, inputs, current_index, current_radio) -> Optional[List[int]]:
-        """Get all radio button indices that belong to the same group"""
+    async def _get_radio_group(self, main_page, inputs, current_index, current_radio,
+                               infos: Optional[List[Dict[str, Any]]] = None) -> Optional[List[int]]:
+        """Get all radio button indices that belong to the same group
+        
+        Args:
+            infos: _snapshot_inputs records for inputs; when given, no attribute reads are needed
+        """
         try:
+            if infos is None:
+                infos = await asyncio.gather(*(input_el.evaluate(_INPUT_SNAPSHOT_JS, None) for input_el in inputs))
+                infos = [info[0] for info in infos]
+            
             # Get the name attribute of the current radio button
-            current_name = await current_radio.get_attribute('name')
+            current_name = infos[current_index]['name']
             if not current_name:
                 return None
             
             # Get the group label/question for this radio group
-            group_question = await self._get_radio_group_question(current_radio)
-            
-            radio_indices = []
+            group_question = await self._get_radio_group_question(current_radio, infos[current_index])
             
             # Find all radio buttons with the same name attribute
-            for i, input_el in enumerate(inputs):
-                input_type = await input_el.get_attribute('type')
-                if input_type == 'radio':
-                    radio_name = await input_el.get_attribute('name')
-                    if radio_name == current_name:
-                        radio_indices.append(i)
+            radio_indices = [
+                i for i, info in enumerate(infos)
+                if info['input_type'] == 'radio' and info['name'] == current_name
+            ]
             
             print(f"Radio group '{group_question}' has {len(radio_indices)} options at indices: {radio_indices}")
             return radio_indices if len(radio_indices) > 1 else None
@@ -375,17 +942,18 @@ class JobApplicationBot:
             
             radio_el = inputs[radio_index]
             
-            # Get radio button information
-            input_id = await radio_el.get_attribute('data-automation-id') or 'unknown'
-            input_type = await radio_el.get_attribute('type')
+            # Get radio button information, labels included, in one evaluate
+            info = await self._read_labels(radio_el)
+            input_id = info.get('input_id', 'unknown')
+            input_type = info.get('input_type')
             
             if input_type != 'radio':
                 print(f"Element at index {radio_index} is not a radio button")
                 return
             
             # Get the radio group question and this specific option
-            group_question = await self._get_radio_group_question(radio_el)
-            option_label = await self._get_nearest_label_text(radio_el) or 'Unknown Option'
+            group_question = await self._get_radio_group_question(radio_el, info)
+            option_label = info['question'] or 'Unknown Option'
             
             print(f"Processing radio option: '{option_label}' for question: '{group_question}'")
             
@@ -398,8 +966,8 @@ class JobApplicationBot:
                 'input_id': input_id,
                 'options': None,
                 'placeholder': None,
-                'required': await radio_el.get_attribute('required'),
-                'role': await radio_el.get_attribute('role')
+                'required': info.get('required'),
+                'role': info.get('role')
             }
             
             # Get AI response for this radio option
@@ -443,232 +1011,402 @@ class JobApplicationBot:
     async def _process_radio_group_as_whole(self, main_page, inputs, radio_indices: List[int]) -> None:
         """Process an entire radio group as a single unit for AI decision"""
         try:
-            if not radio_indices:
+            collected = await self._collect_radio_group(inputs, radio_indices)
+            if not collected:
                 return
-            
-            # Get the first radio to determine the group question
-            first_radio = inputs[radio_indices[0]]
-            group_question = await self._get_radio_group_question(first_radio)
-            
-            # Get aria_labelledby from the first radio element
-            group_label, aria_labelledby = await self._get_group_label_and_aria(first_radio)
-            
-            # Collect all options in this group
-            options = []
-            radio_elements = []
-            
-            for radio_index in radio_indices:
-                radio_el = inputs[radio_index]
-                option_label = await self._get_radio_option_label(radio_el)
-                options.append(option_label)
-                radio_elements.append(radio_el)
-            
-            print(f"Processing radio group: '{group_question}' with options: {options}")
-            
-            # Create element info for AI processing
-            element_info = {
-                'question': group_question,
-                'input_type': 'radio_group',
-                'input_tag': 'radio_group',
-                'input_id': f"radio_group_{await first_radio.get_attribute('name')}",
-                'aria_labelledby': aria_labelledby,  # Add this field
-                'options': options,
-                'placeholder': None,
-                'required': await first_radio.get_attribute('required'),
-                'role': 'radiogroup'
-            }
+            element_info, radio_elements = collected
             
             # Get AI response for the entire radio group
-            full_key = f"[{group_question}, {element_info['input_id']}, radio_group, {aria_labelledby}, radio_group]"
-            
             ai_values, _ = await self.ai_handler.get_ai_response_without_skipping(
                 self.user_data.get('personal_information', {}), 
                 [element_info]
             )
             
-            response = ai_values.get(full_key, 'SKIP')
-            
-            if response and response != 'SKIP':
-                # Find the best matching option
-                selected_index = -1
-                
-                # Try exact match first
-                for i, option in enumerate(options):
-                    if option.lower().strip() == response.lower().strip():
-                        selected_index = i
-                        break
-                
-                # Try partial match if no exact match
-                if selected_index == -1:
-                    for i, option in enumerate(options):
-                        if response.lower() in option.lower() or option.lower() in response.lower():
-                            selected_index = i
-                            break
-                
-                # Select the radio button
-                if selected_index >= 0:
-                    selected_radio = radio_elements[selected_index]
-                    selected_option = options[selected_index]
-                    print(f"Is the option checked {await selected_radio.is_checked()}?")
-                    await selected_radio.check()
-                    print(f"✅ Selected radio option: '{selected_option}' for question: '{group_question}'")
-                else:
-                    print(f" Could not find matching option for AI response: '{response}' in {options}")
-            else:
-                print(f"⏭ Skipping radio group: '{group_question}' (AI said SKIP)")
+            await self._check_radio_option(element_info, radio_elements, ai_values.get(element_info['full_key'], 'SKIP'))
                 
         except Exception as e:
             print(f"Error processing radio group: {e}")
 
+    async def _collect_radio_group(self, inputs, radio_indices: List[int],
+                                   infos: Optional[List[Dict[str, Any]]] = None) -> Optional[Tuple[Dict[str, Any], List[Any]]]:
+        """Build the AI element_info for a radio group and return it with the group's radio handles
+        
+        Args:
+            infos: _snapshot_inputs records for inputs; read on demand when not given
+        """
+        if not radio_indices:
+            return None
+        
+        radio_elements = [inputs[radio_index] for radio_index in radio_indices]
+        if infos is None:
+            radio_infos = [(await radio_el.evaluate(_INPUT_SNAPSHOT_JS, None))[0] for radio_el in radio_elements]
+        else:
+            radio_infos = [infos[radio_index] for radio_index in radio_indices]
+        
+        # The first radio determines the group question and aria_labelledby
+        first_info = radio_infos[0]
+        group_question = first_info['radio_question'] or 'Radio Question'
+        aria_labelledby = first_info['aria_labelledby']
+        
+        # Collect all options in this group
+        options = [info['option_label'] for info in radio_infos]
+        
+        print(f"Processing radio group: '{group_question}' with options: {options}")
+        
+        # Create element info for AI processing
+        element_info = {
+            'question': group_question,
+            'input_type': 'radio_group',
+            'input_tag': 'radio_group',
+            'input_id': f"radio_group_{first_info['name']}",
+            'aria_labelledby': aria_labelledby,  # Add this field
+            'options': options,
+            'placeholder': None,
+            'required': first_info['required'],
+            'role': 'radiogroup'
+        }
+        field_key(element_info)
+        return element_info, radio_elements
+
+    async def _check_radio_option(self, element_info: Dict[str, Any], radio_elements: List[Any], response: Any) -> None:
+        """Check the radio whose option label best matches the AI response"""
+        self._listbox_options_cache.clear()
+        group_question = element_info['question']
+        options = element_info['options']
+        
+        if response and response != 'SKIP':
+            selected_index = _match_option_index(options, response)
+            
+            # Select the radio button
+            if selected_index >= 0:
+                selected_radio = radio_elements[selected_index]
+                selected_option = options[selected_index]
+                print(f"Is the option checked {await selected_radio.is_checked()}?")
+                await selected_radio.check()
+                print(f"✅ Selected radio option: '{selected_option}' for question: '{group_question}'")
+            else:
+                print(f" Could not find matching option for AI response: '{response}' in {options}")
+        else:
+            print(f"⏭ Skipping radio group: '{group_question}' (AI said SKIP)")
+
+    async def _snapshot_inputs(self, root, selector: str) -> Tuple[List[Any], List[Dict[str, Any]]]:
+        """Query the inputs under root together with their attributes and labels
+        
+        Returns the element handles and a parallel list of attribute dicts read in one
+        evaluate call; re-queries if the DOM changed between the two reads.
+        
+        Args:
+            root: ElementHandle or Locator whose descendants matching selector are read; a Locator
+                is resolved to its first match on each call (nothing is read when it has none)
+            selector: CSS selector for the inputs
+        """
+        root = _element_handle(root)
+        if isinstance(root, Locator):
+            # Locator.evaluate is strict (exactly one match), so resolve the first match explicitly
+            try:
+                root = await root.first.element_handle(timeout=5000)
+            except PlaywrightTimeoutError:
+                print("Snapshot root not found, no inputs read")
+                return [], []
+        for _ in range(3):
+            inputs, infos = await asyncio.gather(
+                root.query_selector_all(selector),
+                root.evaluate(_INPUT_SNAPSHOT_JS, selector)
+            )
+            if len(inputs) == len(infos):
+                break
+        self._seed_info_caches(inputs, infos)
+        return inputs, infos
+
+    async def _query_sections(self, main_page) -> Tuple[List["CachedSection"], List[Optional[str]]]:
+        """The page's labelled section groups, wrapped in CachedSection, with their aria-labelledby values
+        
+        The sections are queried once into a JS array; the handles and labels are both read from
+        that same array, so they always line up. The labels are seeded into each wrapper, so
+        processors reading aria-labelledby later hit the cache.
+        """
+        array = await main_page.evaluate_handle(
+            '(root) => Array.from(root.querySelectorAll(\'div[role="group"][aria-labelledby]\'))'
+        )
+        try:
+            properties, labels = await asyncio.gather(
+                array.get_properties(),
+                array.evaluate('els => els.map(el => el.getAttribute("aria-labelledby"))')
+            )
+        finally:
+            await array.dispose()
+        handles = [properties[str(i)].as_element() for i in range(len(labels))]
+        sections = [CachedSection(handle, {'aria-labelledby': label}) for handle, label in zip(handles, labels)]
+        return sections, labels
+
+    def _seed_info_caches(self, inputs: List[Any], infos: List[Dict[str, Any]]) -> None:
+        """Seed the label caches so later helpers (e.g. _fill_single_element) skip their evaluates"""
+        for input_el, info in zip(inputs, infos):
+            self._label_cache[input_el] = info['question']
+            self._group_cache[input_el] = (info['group_label'], info['aria_labelledby'])
+            self._info_cache[input_el] = info
+
+    async def _snapshot_section(self, section, selector: str) -> Tuple[List[Any], List[Dict[str, Any]], Optional[str]]:
+        """_snapshot_inputs, with listbox options filled in from the persisted schema when one is enabled
+        
+        The schema is keyed on the page URL and each input's label, tag, type and automation id,
+        not on element ids, which Workday regenerates on every load. Returns the handles, their
+        records and the key to store resolved options under; the key is None when the schema
+        cache is disabled or already supplied the options.
+        """
+        inputs, infos = await self._snapshot_inputs(section, selector)
+        if self._schema_cache is None:
+            return inputs, infos, None
+        signature = "|".join(
+            f"{info['question']}:{info['input_tag']}:{info['input_type']}:{info['input_id']}" for info in infos
+        )
+        schema_key = hashlib.blake2b(
+            f"{self.page.url}|{selector}|{signature}".encode('utf-8'), digest_size=16
+        ).hexdigest()
+        cached_options = self._schema_cache.get(schema_key)
+        if cached_options is not None and len(cached_options) == len(infos):
+            for info, options in zip(infos, cached_options):
+                if info['options'] is None and options:
+                    info['options'] = options
+            return inputs, infos, None
+        return inputs, infos, schema_key
+
+    def _store_section_schema(self, schema_key: Optional[str], infos: List[Dict[str, Any]],
+                              element_infos: List[Optional[Dict[str, Any]]]) -> None:
+        """Persist the listbox options extraction resolved for a section, one entry per input"""
+        if schema_key is None:
+            return
+        self._schema_cache[schema_key] = [
+            info['options'] or (element_info.get('options') if element_info else None) or None
+            for info, element_info in zip(infos, element_infos)
+        ]
+        self._schema_cache.sync()
+
     async def _process_personal_information_section(self, section) -> None:
-        """Process personal information section with radio/checkbox group handling"""
+        """Process personal information section with radio/checkbox group handling
+        
+        Each pass runs as a LeveledBatch: read listbox options for the new elements (level 0),
+        ask the AI about all of them at once (level 1), then fill them in page order (level 2).
+        Passes repeat until filling stops revealing new fields, then Next is clicked. A field that
+        re-renders after its fill is released for the next pass; a pass that leaves no new field
+        filled also ends the loop, so fields that keep re-rendering cannot spin it.
+        """
         print("Processing Personal Information section")
+        self._reset_label_caches()
         
-        await asyncio.sleep(5)  # Wait for page to load
+        await self._wait_for_form_inputs()
         
-        main_page = await self.page.query_selector('div[data-automation-id="applyFlowPage"]')
+        # A locator re-resolves on every use, so it survives Workday re-rendering the container
+        main_page = self.page.locator('div[data-automation-id="applyFlowPage"]')
         INPUT_SELECTOR = 'button, input, select, textarea, [role="button"]'
         
-        i = 0
-        prev_answered_question = None
+        handled = set()  # Elements already answered (or skipped as duplicates) in an earlier pass
+        answers: Dict[str, Any] = {}  # AI responses by full_key, reused when a field re-renders
     
         while True:
-            # Re-extract elements on each iteration (fresh DOM state)
-            inputs = await main_page.query_selector_all(INPUT_SELECTOR)
-            
-            if i >= len(inputs):
-                print("Reached end of inputs, exiting loop")
-                break
+            handled_before = len(handled)
+            # Re-extract elements on each pass (fresh DOM state)
+            inputs, infos = await self._snapshot_inputs(main_page, INPUT_SELECTOR)
+            batch = LeveledBatch(serial_levels=(0, 2))  # Option reads and fills both drive the page-wide listbox
+            pending: List[Dict[str, Any]] = []  # element_infos still waiting for an AI response
+            next_button = None
+            seen: Dict[Tuple[str, str, Optional[str]], int] = {}
+            prev_answered_question = None
+            
+            i = 0
+            while i < min(len(inputs), len(infos)):
+                input_el = inputs[i]
+                info = infos[i]
                 
-            input_el = inputs[i]
-            
-            # Get element information
-            input_id = await input_el.get_attribute('data-automation-id') or await input_el.get_attribute('aria-haspopup') or 'unknown'
-            input_type = await input_el.get_attribute('type') or 'unknown'
-            
-            # Skip navigation buttons
-            if input_id in ["pageFooterBackButton", "backToJobPosting"]:
+                # Get element information
+                input_id = info['input_id']
+                input_type = info['input_type']
+                
+                # Skip navigation buttons
+                if input_id in SKIP_INPUT_IDS:
+                    i += 1
+                    continue
+                
+                # Next is clicked once no pass adds new work
+                if input_id == "pageFooterNextButton":
+                    next_button = input_el
+                    break
+                
+                aria_labelledby = info['aria_labelledby']
+                question = info['question'] or info['group_label'] or 'UNLABELED'
+                
+                role = info['role']
+                placeholder = info['placeholder']
+                required = info['required']
+                
+                # Identify the element by label and occurrence so indices shifting between passes don't matter
+                label_key = (input_id, question, aria_labelledby)
+                seen[label_key] = seen.get(label_key, 0) + 1
+                element_key = label_key + (seen[label_key],)
+                
+                if input_type == "radio":
+                    # get all radios in this group
+                    radio_indices = await self._get_radio_group(main_page, inputs, i, input_el, infos)
+                    if radio_indices:
+                        if element_key not in handled:
+                            handled.add(element_key)
+                            log.debug("Found radio group with indices: %s", radio_indices)
+                            # The whole group is one question in the same AI batch as the other fields
+                            group = {}
+                            batch.add(0, lambda inputs=inputs, infos=infos, indices=radio_indices, group=group:
+                                      self._queue_radio_group(inputs, infos, indices, group, pending, answers))
+                            batch.add(2, lambda group=group: self._fill_radio_group_from_answers(group, answers))
+                        i += len(radio_indices)
+                        continue
+                
+                if element_key in handled:
+                    # Still the predecessor for the duplicate check, though answered in an earlier pass
+                    if question != 'UNLABELED':
+                        prev_answered_question = question
+                    i += 1
+                    continue
+                
+                # Skip duplicate questions; remembered in handled so later passes skip them too
+                if question != 'UNLABELED' and question == prev_answered_question:
+                    log.debug("⏩ Skipping duplicate question at index %d: '%s'", i, question)
+                    handled.add(element_key)
+                    i += 1
+                    continue
+                
+                log.debug("Processing element %d: Input ID: %s, Question: %s, Type: %s Role: %s, Placeholder: %s, Required: %s",
+                          i, input_id, question, input_type, role, placeholder, required)
+                
+                input_type = _field_input_type(info)
+                input_tag = info['input_tag']
+                
+                # Skip elements with certain directions (like RTL text)
+                element_dir = info['dir']
+                if element_dir and element_dir != 'ltr':
+                    log.debug("Skipping element %s with dir=%s", input_id, element_dir)
+                    i += 1
+                    continue
+                
+                handled.add(element_key)
+                
+                # Create element info for AI processing; popup listbox options are filled in at level 0
+                element_info = {
+                    'question': question or 'UNLABELED',
+                    'aria_labelledby': aria_labelledby,
+                    'input_type': input_type,
+                    'input_tag': input_tag,
+                    'input_id': input_id,
+                    'options': info['options'],
+                    'placeholder': placeholder,
+                    'required': required,
+                    'role': role
+                }
+                full_key = field_key(element_info)
+                
+                # Only popup listboxes need a read; everything else is already in the snapshot
+                if (info['options'] is None and info['aria_haspopup'] == 'listbox'
+                        and (input_tag == 'button' or role == 'combobox')):
+                    batch.add(0, lambda el=input_el, el_info=element_info:
+                              self._read_listbox_options_into(el, el_info))
+                if full_key not in answers:
+                    pending.append(element_info)
+                batch.add(2, lambda el=input_el, el_info=element_info, key=full_key, el_key=element_key:
+                          self._fill_personal_information_element(el, el_info, answers, key, handled, el_key))
+                
+                if question != 'UNLABELED':
+                    prev_answered_question = question
                 i += 1
-                continue
             
-            # Handle Next button
-            if input_id == "pageFooterNextButton":
-                print("Clicking Next button")
-                await input_el.click()
+            if not len(batch):
+                if next_button:
+                    print("Clicking Next button")
+                    await self._click_and_wait_for_submit(next_button)
+                else:
+                    print("Reached end of inputs, exiting loop")
                 break
             
-            # # Handle radio and checkbox groups
-            # if input_type in ['radio', 'checkbox']:
-            #     new_index, processed = await self._handle_radio_checkbox_group(main_page, inputs, i, input_el)
-            #     if processed:
-            #         i = new_index
-            #         continue
+            async def ask_ai(elements=pending):
+                if not elements:
+                    return
+                ai_values, _ = await self.ai_handler.get_ai_response_for_personal_information(
+                    self.user_data.get('personal_information', {}), 
+                    elements
+                )
+                answers.update(ai_values)
             
-            # Process other elements normally
-            group_label, aria_labelledby = await self._get_group_label_and_aria(input_el)
-            question = await self._get_nearest_label_text(input_el) or group_label or 'UNLABELED'
+            batch.add(1, ask_ai)
+            await batch.run()
             
-            role = await input_el.get_attribute('role')
-            placeholder = await input_el.get_attribute('placeholder')
-            required = await input_el.get_attribute('required')
+            # Fills that re-rendered their field released it again; with nothing new left filled, stop
+            if len(handled) == handled_before:
+                print("No new fields filled in this pass, moving on")
+                if next_button:
+                    print("Clicking Next button")
+                    await self._click_and_wait_for_submit(next_button)
+                break
 
-            if input_type == "radio":
-                # get all radios in this group
-                radio_indices = await self._get_radio_group(main_page, inputs, i, input_el)
-                num_radios = len(radio_indices) if radio_indices else 0
-                if radio_indices:
-                    print(f"Found radio group with indices: {radio_indices}")
-                    # Process the entire radio group as one unit
-                    await self._process_radio_group_as_whole(main_page, inputs, radio_indices)
-                    i += num_radios
-                    continue
+    async def _queue_radio_group(self, inputs, infos: List[Dict[str, Any]], radio_indices: List[int], group: Dict[str, Any],
+                                 pending: List[Dict[str, Any]], answers: Dict[str, Any]) -> None:
+        """Level-0 read for _process_personal_information_section: describe a radio group for the AI"""
+        try:
+            collected = await self._collect_radio_group(inputs, radio_indices, infos)
+        except Exception as e:
+            print(f"Error processing radio group: {e}")
+            return
+        if not collected:
+            return
+        group['info'], group['radios'] = collected
+        if group['info']['full_key'] not in answers:
+            pending.append(group['info'])
 
-            # Skip duplicate questions
-            if question != 'UNLABELED' and question == prev_answered_question:
-                print(f"⏩ Skipping duplicate question at index {i}: '{question}'")
-                i += 1
-                continue
-            
-            print("--------------------------------")
-            print(f"Processing element {i}: Input ID: {input_id}, Question: {question}, Type: {input_type}", 
-                  f"Role: {role}, Placeholder: {placeholder}, Required: {required}")
-            
-            # Process other form elements one by one
-            if role == "spinbutton":
-                input_type = "spinbutton"
-            
-            tag_name = await input_el.evaluate("(el) => el.tagName.toLowerCase()")
-            if tag_name and tag_name.lower() == 'textarea':
-                input_type = 'textarea'
-            input_tag = tag_name
-            
-            # Skip elements with certain directions (like RTL text)
-            element_dir = await input_el.get_attribute('dir')
-            if element_dir and element_dir != 'ltr':
-                print(f"Skipping element {input_id} with dir={element_dir}")
-                i += 1
-                continue
-            
-            # Get options for relevant input types
-            options = await self._get_element_options(input_el, input_tag, input_type)
-            
-            print(f"Processing form element: {question}")
-            
-            # Start timing for this question when it's identified
-            if question and question != "UNLABELED":
-                self._start_question_timing(question, input_id)
-            
-            # Create element info for AI processing
-            element_info = {
-                'question': question or 'UNLABELED',
-                'aria_labelledby': aria_labelledby,
-                'input_type': input_type,
-                'input_tag': input_tag,
-                'input_id': input_id,
-                'options': options,
-                'placeholder': placeholder,
-                'required': required,
-                'role': role
-            }
-            
-            # Get AI response for this single element
-            full_key = f"[{element_info['question']}, {element_info['input_id']}, {element_info['input_type']}, {element_info['aria_labelledby']}, {element_info['input_tag']}]"
-            ai_values, _ = await self.ai_handler.get_ai_response_for_personal_information(
-                self.user_data.get('personal_information', {}), 
-                [element_info]
-            )
-            response = ai_values.get(full_key, 'SKIP')
-            
-            print(f"AI response for field '{question}': {response}")
-            
-            # Fill this single element
-            await self._fill_single_element(
-                input_el, 
-                input_id, 
-                input_type, 
-                input_tag, 
-                response,
-                options,
-                question
-            )
-            
-            # Update tracking
-            if question != 'UNLABELED':
-                prev_answered_question = question
-            
-            # Move to next element
-            i += 1
-            
-            # Small delay to prevent overwhelming the page
-            await asyncio.sleep(0.5)
+    async def _fill_radio_group_from_answers(self, group: Dict[str, Any], answers: Dict[str, Any]) -> None:
+        """Level-2 write for _process_personal_information_section: check the answered radio"""
+        if not group:
+            return
+        try:
+            element_info = group['info']
+            await self._check_radio_option(element_info, group['radios'], answers.get(element_info['full_key'], 'SKIP'))
+        except Exception as e:
+            print(f"Error processing radio group: {e}")
+
+    async def _read_listbox_options_into(self, input_el, element_info: Dict[str, Any]) -> None:
+        """Level-0 read for _process_personal_information_section: attach listbox options"""
+        element_info['options'] = await self._get_element_options(
+            input_el, element_info['input_tag'], element_info['input_type'], self._info_cache.get(input_el)
+        )
+
+    async def _fill_personal_information_element(self, input_el, element_info: Dict[str, Any], answers: Dict[str, Any],
+                                                 full_key: str, handled: set, element_key: Tuple) -> None:
+        """Level-2 write for _process_personal_information_section
+        
+        A field re-rendered by an earlier fill is released so the next pass picks it up again,
+        reusing the AI answer already stored in answers.
+        """
+        if not await input_el.evaluate('el => el.isConnected'):
+            handled.discard(element_key)
+            return
+        
+        response = answers.get(full_key, 'SKIP')
+        log.info("AI response for field '%s': %s", element_info['question'], response)
+        
+        await self._fill_single_element(
+            input_el, 
+            element_info['input_id'], 
+            element_info['input_type'], 
+            element_info['input_tag'], 
+            response,
+            element_info['options'],
+            element_info['question']
+        )
 
     async def _process_later_sections(self, section) -> None:
         """Process personal information section with radio/checkbox group handling"""
         print("Processing later sections")
+        self._reset_label_caches()
 
-        await asyncio.sleep(5)  # Wait for page to load
+        await self._wait_for_form_inputs()
         
-        main_page = await self.page.query_selector('div[data-automation-id="applyFlowPage"]')
+        # A locator re-resolves on every use, so it survives Workday re-rendering the container
+        main_page = self.page.locator('div[data-automation-id="applyFlowPage"]')
         
         # Check for disability status fieldset first
         disability_status_group = await self.page.query_selector('fieldset[data-automation-id="disabilityStatus-CheckboxGroup"]')
@@ -682,29 +1420,32 @@ class JobApplicationBot:
         i = 0
         prev_answered_question = None
         prev_type = None
+        date_parts = _today_date_parts()  # Disability sign-off date, computed once per section
+    
+        elements: List[Tuple[Any, Dict[str, Any]]] = []
+        dirty = True  # Set after fills that can add or re-render fields
     
         while True:
-            # Re-extract elements on each iteration (fresh DOM state)
-            inputs = await main_page.query_selector_all(INPUT_SELECTOR)
-            # for input_el in inputs:
-            #     input_type = await input_el.get_attribute('type')
-            #     input_id = await input_el.get_attribute('data-automation-id') or await input_el.get_attribute('aria-haspopup') or 'unknown'
-            #     print(f"Input_id :{input_id}  Input type: {input_type}")
+            # Re-extract elements only when the last action may have changed the DOM; elements the
+            # loop would always skip (navigation, checkboxes owned by the disability handler) are
+            # filtered out here so indices only cover fillable elements
+            if dirty:
+                elements = [
+                    (input_el, info)
+                    for input_el, info in _fillable_inputs(*await self._snapshot_inputs(main_page, INPUT_SELECTOR))
+                    if not (disability_status_group and info['input_type'] == "checkbox")
+                ]
+                dirty = False
                 
-            if i >= len(inputs):
+            if i >= len(elements):
                 print("Reached end of inputs, exiting loop")
                 break
                 
-            input_el = inputs[i]
+            input_el, info = elements[i]
             
             # Get element information
-            input_id = await input_el.get_attribute('data-automation-id') or await input_el.get_attribute('aria-haspopup') or 'unknown'
-            input_type = await input_el.get_attribute('type') or 'unknown'
-            
-            # Skip navigation buttons
-            if input_id in ["pageFooterBackButton", "backToJobPosting"]:
-                i += 1
-                continue
+            input_id = info['input_id']
+            input_type = info['input_type']
             
             # # Handle Next button
             # if input_id == "pageFooterNextButton":
@@ -716,43 +1457,24 @@ class JobApplicationBot:
             if input_id == "pageFooterNextButton":
                 print("Found Next button")
                 break
-
-            if disability_status_group and input_type == "checkbox":
-                i+=1
-                continue
             
             # Process other elements normally
-            group_label, aria_labelledby = await self._get_group_label_and_aria(input_el)
-            question = await self._get_nearest_label_text(input_el) or group_label or 'UNLABELED'
+            aria_labelledby = info['aria_labelledby']
+            question = info['question'] or info['group_label'] or 'UNLABELED'
             
-            role = await input_el.get_attribute('role')
-            placeholder = await input_el.get_attribute('placeholder')
-            required = await input_el.get_attribute('required')
+            role = info['role']
+            placeholder = info['placeholder']
+            required = info['required']
 
             # Handle special case for disability date section
             if "dateSection" in input_id and aria_labelledby == "selfIdentifiedDisabilityData-section":
-                formatted_date = date.today().strftime("%d-%m-%Y")
-                day, month, year = formatted_date.split('-')
-                print(f"Day: {day}, Month: {month}, Year: {year}")
-                response = None
+                part = next((part for part in DATE_PARTS if part in input_id.lower()), None)
+                response = date_parts.get(part)
                 
-                if "day" in input_id.lower():
-                    input_type = "spinbutton"
-                    input_tag = "input"
-                    input_id = "selfIdentifiedDisabilityData-day"
-                    response = day
-                elif "month" in input_id.lower():
-                    input_type = "spinbutton"
-                    input_tag = "input"
-                    input_id = "selfIdentifiedDisabilityData-month"
-                    response = month
-                elif "year" in input_id.lower():
+                if response:
                     input_type = "spinbutton"
                     input_tag = "input"
-                    input_id = "selfIdentifiedDisabilityData-year"
-                    response = year
-                
-                if response:
+                    input_id = f"selfIdentifiedDisabilityData-{part}"
                     await self._fill_single_element(
                         input_el, 
                         input_id, 
@@ -773,36 +1495,29 @@ class JobApplicationBot:
             #     continue
             # print("Disability status section not found continue with regular processing")      
                
-            print(f"Previous question: {prev_answered_question}, Current question: {question}, previous type : {prev_type}, current_role : {role}")
+            log.debug("Previous question: %s, Current question: %s, previous type : %s, current_role : %s",
+                      prev_answered_question, question, prev_type, role)
             # Skip duplicate questions
             if question != 'UNLABELED' and question == prev_answered_question and role != "spinbutton" and prev_type == "button":
-                print(f"⏩ Skipping duplicate question at index {i}: '{question}'")
+                log.debug("⏩ Skipping duplicate question at index %d: '%s'", i, question)
                 i += 1
                 continue
             
-            print("--------------------------------")
-            print(f"Processing element {i}: Input ID: {input_id}, Question: {question}, Type: {input_type}")
+            log.debug("Processing element %d: Input ID: %s, Question: %s, Type: %s", i, input_id, question, input_type)
             
             # Process other form elements one by one
-            if role == "spinbutton":
-                input_type = "spinbutton"
-            
-            tag_name = await input_el.evaluate("(el) => el.tagName.toLowerCase()")
-            if tag_name and tag_name.lower() == 'textarea':
-                input_type = 'textarea'
-            input_tag = tag_name
+            input_type = _field_input_type(info)
+            input_tag = info['input_tag']
             
             # Skip elements with certain directions (like RTL text)
-            element_dir = await input_el.get_attribute('dir')
+            element_dir = info['dir']
             if element_dir and element_dir != 'ltr':
                 print(f"Skipping element {input_id} with dir={element_dir}")
                 i += 1
                 continue
             
             # Get options for relevant input types
-            options = await self._get_element_options(input_el, input_tag, input_type)
-            
-            print(f"Processing form element: {question}")
+            options = await self._get_snapshot_options(input_el, info, input_tag, input_type)
             
             # Start timing for this question when it's identified
             if question and question != "UNLABELED":
@@ -822,14 +1537,14 @@ class JobApplicationBot:
             }
             
             # Get AI response for this single element
-            full_key = f"[{element_info['question']}, {element_info['input_id']}, {element_info['input_type']}, {element_info['aria_labelledby']}, {element_info['input_tag']}]"
+            full_key = field_key(element_info)
             ai_values, _ = await self.ai_handler.get_ai_response_without_skipping(
                 self.user_data.get('personal_information', {}), 
                 [element_info]
             )
             response = ai_values.get(full_key, 'SKIP')
             
-            print(f"AI response for field '{question}': {response}")
+            log.info("AI response for field '%s': %s", question, response)
             
             # Fill this single element
             await self._fill_single_element(
@@ -841,6 +1556,8 @@ class JobApplicationBot:
                 options,
                 question
             )
+            # Dropdowns, selects and checkboxes can reveal follow-up questions; plain text fills don't
+            dirty = input_tag in ('button', 'select') or options is not None or input_type in ('radio', 'checkbox')
             
             # Update tracking
             if question != 'UNLABELED':
@@ -849,9 +1566,6 @@ class JobApplicationBot:
             
             # Move to next element
             i += 1
-            
-            # Small delay to prevent overwhelming the page
-            await asyncio.sleep(0.5)
 
     async def _process_experience_section(self, section) -> None:
         """Process work experience section with add functionality"""
@@ -979,13 +1693,17 @@ class JobApplicationBot:
         """Process resume upload section"""
         print("Processing Resume section")
         
-        # Look for file input
-        file_input = await section.query_selector('input[type="file"]')
+        resume_path = self.user_data.get('documents', {}).get('resume_path', '')
+        
+        # Look for the file input while the resume is checked on disk off the event loop
+        file_input, (exists, size) = await asyncio.gather(
+            section.query_selector('input[type="file"]'),
+            asyncio.to_thread(_validate_resume, resume_path) if resume_path else asyncio.sleep(0, (False, 0))
+        )
         if file_input:
-            resume_path = self.user_data.get('documents', {}).get('resume_path', '')
-            if resume_path and os.path.exists(resume_path):
+            if exists and size:
                 await file_input.set_input_files([resume_path])
-                print(f"Uploaded resume: {resume_path}")
+                print(f"Uploaded resume: {resume_path} ({size} bytes)")
             else:
                 print("Resume file not found or not specified")
 
@@ -1005,11 +1723,16 @@ class JobApplicationBot:
         # Find checkboxes
         checkboxes = await section.query_selector_all('input[type="checkbox"]')
         
-        for i, checkbox in enumerate(checkboxes, 1):
+        # Read every checkbox's label concurrently, one evaluate each
+        label_texts = await asyncio.gather(
+            *(checkbox.evaluate('el => (el.closest("label") || {}).textContent || ""') for checkbox in checkboxes),
+            return_exceptions=True
+        )
+        
+        for i, (checkbox, label_text) in enumerate(zip(checkboxes, label_texts), 1):
             try:
-                label_handle = await checkbox.evaluate_handle('el => el.closest("label")')
-                label = label_handle.as_element() if label_handle else None
-                label_text = await label.text_content() if label else ''
+                if isinstance(label_text, Exception):
+                    raise label_text
                 
                 # Select "do not have a disability" option
                 if label_text and "do not have a disability" in label_text.lower():
@@ -1028,22 +1751,11 @@ class JobApplicationBot:
             except Exception as e:
                 print(f"Error processing disability checkbox {i}: {e}")
         
-        # Fill date fields if present
-        current_date = datetime.now()
-        date_fields = [
-            ("selfIdentifiedDisabilityData--dateSignedOn-dateSectionMonth-input", f"{current_date.month:02d}"),
-            ("selfIdentifiedDisabilityData--dateSignedOn-dateSectionDay-input", f"{current_date.day:02d}"),
-            ("selfIdentifiedDisabilityData--dateSignedOn-dateSectionYear-input", str(current_date.year)),
-        ]
-        
-        for field_id, default_value in date_fields:
-            selector = f'input[id="{field_id}"]'
-            field = await self.page.query_selector(selector)
-            if field:
-                value = await field.input_value()
-                if not value:
-                    await field.fill(default_value)
-                    log_data['date_fields'].append({'field_id': field_id, 'value': default_value})
+        # Fill whichever date fields are present and still empty, in one round-trip
+        date_parts = _today_date_parts()
+        field_values = [[field_id, date_parts[part]] for field_id, part in DISABILITY_DATE_FIELDS]
+        filled = await self.page.evaluate(_FILL_EMPTY_INPUTS_JS, field_values)
+        log_data['date_fields'].extend({'field_id': field_id, 'value': value} for field_id, value in filled)
         
         # Save log
         log_path = self.current_run_dir / "disability_disclosures.json"
@@ -1127,7 +1839,11 @@ class JobApplicationBot:
             print(f"Error handling disability status checkboxes: {str(e)}")
 
     async def _process_generic_section(self, section, section_name: str, data=None) -> None:
-        """Process any generic section using AI"""
+        """Process any generic section using AI
+        
+        Runners call this per section in page order, so fields revealed by an earlier
+        section's answers are present when a later section is extracted.
+        """
         print(f"Processing Generic section: {section_name}")
         
         # Check for disability status fieldset first
@@ -1143,7 +1859,7 @@ class JobApplicationBot:
         if not form_elements:
             print(f"No form elements found in {section_name} section")
             return
-        if data == None:
+        if data is None:
             data = self.user_data
         # Use entire user data for unknown sections
         ai_response, key_mapping = await self.ai_handler.get_ai_response_for_section(data, form_elements)
@@ -1164,98 +1880,127 @@ class JobApplicationBot:
             items_data = []
         
         print(f"Found {len(items_data)} {section_type} entries")
+        self._reset_label_caches()
         
         if not items_data:
             return
         previous_aria_label_section_number = None
-        # Process each item
-        for i, item_data in enumerate(items_data):
-            print(f"\n=== Filling {section_type} {i + 1} ===")
-            
-            # Click add button for each entry
-            add_button = await section.query_selector('button[data-automation-id="add-button"]')
-            if add_button and (previous_aria_label_section_number == None or previous_aria_label_section_number < f"{len(items_data)}-panel"):
-                await add_button.click()
-                await asyncio.sleep(2)
-                print(f"Clicked add button for {section_type} {i + 1}")
-                previous_aria_label_section_number = f"{len(items_data)}-panel"
-            
-            inputs = await section.query_selector_all('input, button, textarea, select')
-            panel_elements = []
-            previous_question = None
-            previous_type = None
-
-            for input_el in inputs:
-                input_id = await input_el.get_attribute('data-automation-id') or await input_el.get_attribute('aria-haspopup') or 'unknown'
-                if input_id in ["pageFooterBackButton", "pageFooterNextButton", "backToJobPosting"]:
-                    continue
+        last_panel = f"{len(items_data)}-panel"
+        collected = []  # (item_data, panel_elements) per entry, in panel order
+        prefetch = None  # get_repeated_schema_answers task started from the first panel
+        # Pass A: add panels and enumerate their elements (serial, Workday adds panels one at a time)
+        collected_all = False
+        try:
+            for i, item_data in enumerate(items_data):
+                print(f"\n=== Collecting {section_type} {i + 1} ===")
+                # Built once per panel; the word boundaries keep panel 1 from matching "11-panel"
+                panel_re = re.compile(rf'\b{i + 1}-panel\b')
+            
+                # Click add button for each entry
+                add_button = await section.query_selector('button[data-automation-id="add-button"]')
+                if add_button and (previous_aria_label_section_number == None or previous_aria_label_section_number < last_panel):
+                    await add_button.click()
+                    try:
+                        await section.wait_for_selector(f'[aria-labelledby*="{i + 1}-panel"]', timeout=5000)
+                    except PlaywrightTimeoutError:
+                        print(f"Panel {i + 1} did not appear after clicking add, continuing")
+                    print(f"Clicked add button for {section_type} {i + 1}")
+                    previous_aria_label_section_number = last_panel
+            
+                inputs, infos = await self._snapshot_inputs(section, 'input, button, textarea, select')
+                panel_elements = []
+                previous_question = None
+                previous_type = None
+
+                for input_el, info in zip(inputs, infos):
+                    input_id = info['input_id']
+                    if input_id in ["pageFooterBackButton", "pageFooterNextButton", "backToJobPosting"]:
+                        continue
 
-                group_label, aria_labelledby = await self._get_group_label_and_aria(input_el)
-                question = await self._get_nearest_label_text(input_el) or 'UNLABELED'
+                    aria_labelledby = info['aria_labelledby']
+                    question = info['question'] or 'UNLABELED'
 
-                input_type = await input_el.get_attribute('type') or 'unknown'
-                role = await input_el.get_attribute('role')
-                placeholder = await input_el.get_attribute('placeholder')
-                required = await input_el.get_attribute('required')
+                    input_type = _field_input_type(info)
+                    role = info['role']
+                    placeholder = info['placeholder']
+                    required = info['required']
 
-                if role == "spinbutton":
-                    input_type = "spinbutton"
-
-                # Enhanced duplicate question detection like in the notebook
-                print(f"Input ID: {input_id}, Question: {question}, aria-labelledby: {aria_labelledby or 'None'}")
-                print(f"Previous question: {previous_question}, Previous type: {previous_type}")
+                    # Enhanced duplicate question detection like in the notebook
+                    log.debug("Input ID: %s, Question: %s, aria-labelledby: %s", input_id, question, aria_labelledby or 'None')
+                    log.debug("Previous question: %s, Previous type: %s", previous_question, previous_type)
                 
-                if (question != 'UNLABELED' and 
-                    question == previous_question and 
-                    previous_type == "button" and 
-                    input_id != "file-upload-input-ref"):
-                    print(f"Skipping duplicate question: '{question}', previous type was '{previous_type}'")
-                    continue
+                    if (question != 'UNLABELED' and 
+                        question == previous_question and 
+                        previous_type == "button" and 
+                        input_id != "file-upload-input-ref"):
+                        log.debug("Skipping duplicate question: '%s', previous type was '%s'", question, previous_type)
+                        continue
 
-                input_tag = await input_el.evaluate("(el) => el.tagName.toLowerCase()")
-                if input_tag and input_tag.lower() == 'textarea':
-                    input_type = 'textarea'
+                    input_tag = info['input_tag']
                 
-                # Get options for all relevant input types
-                options = await self._get_element_options(input_el, input_tag, input_type)
-
-                # Only include elements that belong to the current panel
-                if aria_labelledby and f'{i + 1}-panel' in aria_labelledby:
-                    panel_elements.append({
-                        'element': input_el,
-                        'question': question or 'UNLABELED',
-                        'aria_labelledby': aria_labelledby,
-                        'input_type': input_type,
-                        'input_tag': input_tag,
-                        'input_id': input_id,
-                        'options': options,
-                        'placeholder': placeholder,
-                        'required': required,
-                        'role': role
-                    })
-
-                # Update tracking variables like in the notebook
-                if question != 'UNLABELED':
-                    previous_question = question
-                    previous_type = input_type
-
-            
+                    # Get options for all relevant input types
+                    options = await self._get_snapshot_options(input_el, info, input_tag, input_type)
+
+                    # Only include elements that belong to the current panel
+                    if aria_labelledby and panel_re.search(aria_labelledby):
+                        panel_elements.append({
+                            'element': input_el,
+                            'question': question or 'UNLABELED',
+                            'aria_labelledby': aria_labelledby,
+                            'input_type': input_type,
+                            'input_tag': input_tag,
+                            'input_id': input_id,
+                            'options': options,
+                            'placeholder': placeholder,
+                            'required': required,
+                            'role': role
+                        })
+
+                    # Update tracking variables like in the notebook
+                    if question != 'UNLABELED':
+                        previous_question = question
+                        previous_type = input_type
+
+            
+            
+                if panel_elements:
+                    if log.isEnabledFor(logging.DEBUG):
+                        log.debug("Panel Elements Count: %d", len(panel_elements))
+                        for field in panel_elements:
+                            log.debug("Element: %s, Type: %s, Options: %s",
+                                      field['question'], field['input_type'], field['options'] or 'None')
+                    collected.append((item_data, panel_elements))
+                    # The first panel gives the schema every entry shares, so the prompt for all of
+                    # them can run while the remaining panels are added and enumerated
+                    if prefetch is None and len(items_data) > 1:
+                        schema_fields = self.ai_handler.uncached_section_fields(item_data, panel_elements)
+                        if schema_fields:
+                            prefetch = asyncio.create_task(
+                                self.ai_handler.get_repeated_schema_answers(items_data, schema_fields)
+                            )
+            collected_all = len(collected) == len(items_data)
+        finally:
+            # Prefetched answers are indexed by entry, so they only line up if every panel was
+            # collected; otherwise (or if Pass A raised) the task is cancelled and reaped here
+            if prefetch is not None and not collected_all:
+                prefetch.cancel()
+                await asyncio.gather(prefetch, return_exceptions=True)
+                prefetch = None
+        
+        # Pass B: panels sharing one schema are answered in a single prompt
+        responses = await self.ai_handler.get_ai_responses_for_repeated_panels(
+            [item_data for item_data, _ in collected],
+            [panel_elements for _, panel_elements in collected],
+            prefetched=prefetch
+        )
+        
+        # Pass C: fill the panels one at a time
+        for i, (ai_values, key_mapping) in enumerate(responses):
+            print(f"\n=== Filling {section_type} {i + 1} ===")
+            log.debug("AI Response: %s", ai_values)
             
-            if panel_elements:
-                print(f"Panel Elements Count: {len(panel_elements)}")
-                for field in panel_elements:
-                    input_type = field['input_type']
-                    options = field['options'] if field['options'] else 'None'
-                    print(f"Element: {field['question']}, Type: {input_type}, Options: {options}")
-
-                # Get AI response with complete element information
-                ai_values, key_mapping = await self.ai_handler.get_ai_response_for_section(item_data, panel_elements)
-                print("AI Response:", ai_values)
-
-                # Fill all elements with validation
-                await self._fill_form_elements(ai_values, key_mapping)
-                
-            await asyncio.sleep(2)
+            # Fill all elements with validation
+            await self._fill_form_elements(ai_values, key_mapping)
 
     async def _extract_form_elements_from_section(self, section) -> List[Dict[str, Any]]:
         """Extract form elements from a specific section with duplicate question filtering and radio button grouping"""
@@ -1263,15 +2008,16 @@ class JobApplicationBot:
             elements = []
             radio_groups = {}  # Group radio buttons by question/name
             
-            # Find all input elements in the section
-            inputs = await section.query_selector_all('input, button, textarea, select')
+            # Find all input elements in the section; with the schema cache on, a section seen before skips the listbox reads
+            inputs, infos, schema_key = await self._snapshot_section(section, 'input, button, textarea, select')
+            element_infos = await self._extract_element_infos(inputs, infos)
+            self._store_section_schema(schema_key, infos, element_infos)
             
-            for input_el in inputs:
-                element_info = await self._extract_element_info(input_el)
+            for input_el, info, element_info in zip(inputs, infos, element_infos):
                 if element_info:
                     current_question = element_info['question'].lower().strip()
                     is_current_listbox = (element_info['input_tag'] == 'button' and 
-                                        await input_el.get_attribute('aria-haspopup') == 'listbox')
+                                        info['aria_haspopup'] == 'listbox')
                     
                     # Handle radio buttons - group them by question/name
                     if element_info['input_type'] == 'radio':
@@ -1344,38 +2090,23 @@ class JobApplicationBot:
         except:
             return 'unknown_group'
 
-    async def _get_radio_group_question(self, input_el) -> str:
-        """Get the question text for a radio button group"""
+    async def _get_radio_group_question(self, input_el, info: Optional[Dict[str, Any]] = None) -> str:
+        """Get the question text for a radio button group, memoized per group name
+        
+        Args:
+            info: The radio's _snapshot_inputs record; read with one evaluate when not given
+        """
         try:
-            # Look for fieldset legend
-            question = await input_el.evaluate('''
-                el => {
-                    let group = el.closest("fieldset, [role='group']");
-                    if (group) {
-                        let legend = group.querySelector("legend");
-                        if (legend && legend.textContent) return legend.textContent.trim();
-                        
-                        let labelledby = group.getAttribute("aria-labelledby");
-                        if (labelledby) {
-                            let labelEl = document.getElementById(labelledby);
-                            if (labelEl && labelEl.textContent) return labelEl.textContent.trim();
-                        }
-                        
-                        // Look for any label within the group that's not an option label
-                        let labels = group.querySelectorAll("label");
-                        for (let label of labels) {
-                            // Skip labels that are directly for radio inputs (these are option labels)
-                            if (!label.getAttribute('for') || !document.getElementById(label.getAttribute('for'))?.type === 'radio') {
-                                if (label.textContent) return label.textContent.trim();
-                            }
-                        }
-                    }
-                    return 'Radio Question';
-                }
-            ''')
-            
-            return question or 'Radio Question'
-        except:
+            if info is None:
+                info = await self._read_labels(input_el)
+            name = info.get('name')
+            if name and name in self._radio_question_cache:
+                return self._radio_question_cache[name]
+            question = info.get('radio_question') or 'Radio Question'
+            if name:
+                self._radio_question_cache[name] = question
+            return question
+        except Exception:
             return 'Radio Question'
 
     async def _extract_form_elements_from_page(self) -> List[Dict[str, Any]]:
@@ -1384,14 +2115,15 @@ class JobApplicationBot:
             elements = []
             
             # Find all input elements on the page
-            inputs = await self.page.query_selector_all('input, button, textarea, select')
+            body = await self.page.query_selector('body')
+            inputs, infos = await self._snapshot_inputs(body, 'input, button, textarea, select')
+            element_infos = await self._extract_element_infos(inputs, infos)
             
-            for input_el in inputs:
-                element_info = await self._extract_element_info(input_el)
+            for info, element_info in zip(infos, element_infos):
                 if element_info:
                     current_question = element_info['question'].lower().strip()
                     is_current_listbox = (element_info['input_tag'] == 'button' and 
-                                        await input_el.get_attribute('aria-haspopup') == 'listbox')
+                                        info['aria_haspopup'] == 'listbox')
                     
                     # Skip if this question is the same as previous AND previous was a listbox
                     if (self.previous_question and 
@@ -1412,22 +2144,41 @@ class JobApplicationBot:
             print(f"Error extracting form elements from page: {e}")
             return []
 
-    async def _extract_element_info(self, input_el) -> Optional[Dict[str, Any]]:
-        """Extract information about a form element"""
+    async def _extract_element_infos(self, inputs, infos: List[Dict[str, Any]]) -> List[Optional[Dict[str, Any]]]:
+        """Run _extract_element_info for every input concurrently, in input order
+        
+        Elements that fail come back as None, like those _extract_element_info skips.
+        """
+        results = await asyncio.gather(
+            *(self._extract_element_info(input_el, info) for input_el, info in zip(inputs, infos)),
+            return_exceptions=True
+        )
+        return [None if isinstance(result, BaseException) else result for result in results]
+
+    async def _extract_element_info(self, input_el, info: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        """Extract information about a form element
+        
+        Args:
+            input_el: Element handle to describe
+            info: The element's _snapshot_inputs record; when given, no attribute reads are needed
+        """
         try:
-            input_tag = await input_el.evaluate('el => el.tagName.toLowerCase()')
-            input_type = await input_el.get_attribute('type') or 'unknown'
-            input_id = await input_el.get_attribute('id') or 'unknown'
+            if info is None:
+                info = (await input_el.evaluate(_INPUT_SNAPSHOT_JS, None))[0]
+            input_tag = info['input_tag']
+            input_type = info['input_type']
+            input_id = info['element_id']
             
-            # Get label information
-            question = await self._get_nearest_label_text(input_el)
-            group_label, aria_labelledby = await self._get_group_label_and_aria(input_el)
+            # Label information comes with the snapshot record too
+            question = info['question']
+            group_label = info['group_label']
+            aria_labelledby = info['aria_labelledby']
             
             # Special handling for radio buttons
             if input_type == 'radio':
                 # For radio buttons, get both group question and specific option label
                 group_question = question or group_label or 'UNLABELED'
-                option_label = await self._get_radio_option_label(input_el)
+                option_label = info['option_label']
                 
                 return {
                     'element': input_el,
@@ -1439,17 +2190,18 @@ class JobApplicationBot:
                     'aria_labelledby': aria_labelledby,
                     'options': None,
                     'placeholder': None,
-                    'required': await input_el.get_attribute('aria-required'),
-                    'role': await input_el.get_attribute('role')
+                    'required': info['aria_required'],
+                    'role': info['role']
                 }
             
             # Get options for dropdown elements
-            options = await self._get_element_options(input_el, input_tag, input_type)
+            async with self._extract_semaphore:
+                options = await self._get_snapshot_options(input_el, info, input_tag, input_type)
             
             # Get other attributes
-            placeholder = await input_el.get_attribute('placeholder')
-            required = await input_el.get_attribute('aria-required')
-            role = await input_el.get_attribute('role')
+            placeholder = info['placeholder']
+            required = info['aria_required']
+            role = info['role']
             
             return {
                 'element': input_el,
@@ -1468,182 +2220,89 @@ class JobApplicationBot:
             print(f"Error extracting element info: {e}")
             return None
 
+    def _reset_label_caches(self) -> None:
+        """Drop memoized label lookups (handles from a previous section are stale)"""
+        self._label_cache.clear()
+        self._group_cache.clear()
+        self._radio_question_cache.clear()
+        self._info_cache.clear()
+
     async def _get_nearest_label_text(self, element) -> Optional[str]:
-        """Get the nearest label text for a form element"""
+        """Get the nearest label text for a form element, memoized per handle"""
+        if element not in self._label_cache:
+            await self._read_labels(element)
+        return self._label_cache[element]
 
-        try:
-            # PRIORITY 1: Try form field container label (most reliable for this structure)
-            form_field_label = await element.evaluate('''
-                el => {
-                    // First, try to find the immediate formField container
-                    let cur = el.parentElement;
-                    let depth = 0;
-                    while (cur && depth < 10) {
-                        if (cur.tagName.toLowerCase() === "div" &&
-                            cur.getAttribute("data-automation-id")?.startsWith("formField-")) {
-                            // Found the form field container, now find its label
-                            const lbl = cur.querySelector("label");
-                            if (lbl && lbl.textContent) {
-                                return lbl.textContent.trim();
-                            }
-                        }
-                        cur = cur.parentElement;
-                        depth++;
-                    }
-                    return null;
-                }
-            ''')
-            if form_field_label:
-                print("Found label by form field container:", form_field_label)
-                return form_field_label.replace('*', '').strip()
-
-            # PRIORITY 2: Try label that correctly references this element's ID
-            element_id = await element.get_attribute('id')
-            if element_id and element_id != "unknown":
-                # Make sure the label's 'for' attribute matches exactly AND the element is in the same form field
-                correct_label = await element.evaluate(f'''
-                    el => {{
-                        // Find all labels with matching 'for' attribute
-                        const labels = document.querySelectorAll('label[for="{element_id}"]');
-                        
-                        // Check each label to see if it's in the same form field container as this element
-                        for (let label of labels) {{
-                            let labelContainer = label.closest('[data-automation-id^="formField-"]');
-                            let elementContainer = el.closest('[data-automation-id^="formField-"]');
-                            
-                            // If both are in the same container, this is the correct label
-                            if (labelContainer && elementContainer && labelContainer === elementContainer) {{
-                                return label.textContent ? label.textContent.trim() : null;
-                            }}
-                        }}
-                        return null;
-                    }}
-                ''')
-                if correct_label:
-                    print("Found correct label by ID match in same container:", correct_label)
-                    return correct_label.replace('*', '').strip()
-            
-            # PRIORITY 3: Try parent label
-            parent_label_handle = await element.evaluate_handle('el => el.closest("label")')
-            parent_label = parent_label_handle.as_element() if parent_label_handle else None
-            if parent_label:
-                label_text = await parent_label.text_content()
-                if label_text:
-                    print("Found label by parent label:", label_text)
-                    return label_text.replace('*', '').strip()
-            
-            # PRIORITY 4: Try aria-labelledby
-            aria_labelledby = await element.get_attribute('aria-labelledby')
-            if aria_labelledby:
-                label_element = await self.page.query_selector(f'#{aria_labelledby}')
-                if label_element:
-                    label_text = await label_element.text_content()
-                    if label_text:
-                        print("Found label by aria-labelledby:", label_text)
-                        return label_text.replace('*', '').strip()
-            
-            # PRIORITY 5: Try fieldset legend
-            fieldset_legend = await element.evaluate('''
-                el => {
-                    let fieldset = el.closest("fieldset");
-                    if (fieldset) {
-                        let legend = fieldset.querySelector("legend");
-                        if (legend && legend.textContent && legend.textContent.trim() !== "") {
-                            return legend.textContent.trim();
-                        }
-                    }
-                    return null;
-                }
-            ''')
-            
-            if fieldset_legend:
-                return fieldset_legend.replace('*', '').strip()
+    async def _get_group_label_and_aria(self, element) -> Tuple[Optional[str], Optional[str]]:
+        """Get group label and aria-labelledby information, memoized per handle"""
+        if element not in self._group_cache:
+            await self._read_labels(element)
+        return self._group_cache[element]
 
-            # PRIORITY 6: Try aria-label
-            aria_label = await element.get_attribute('aria-label')
-            if aria_label:
-                print("Found label by aria-label:", aria_label)
-                return aria_label.replace('*', '').strip()
-            
-            # PRIORITY 7: Try placeholder as fallback
-            placeholder = await element.get_attribute('placeholder')
-            if placeholder:
-                print("Found label by placeholder:", placeholder)
-                return placeholder.replace('*', '').strip()
-            
-            return None
+    async def _read_labels(self, element) -> Dict[str, Any]:
+        """Read every label field of one element with a single evaluate and seed the per-handle caches"""
+        try:
+            info = (await element.evaluate(_INPUT_SNAPSHOT_JS, None))[0]
+            self._info_cache[element] = info
         except Exception as e:
             print(f"Error getting label for element: {e}")
-            return None
-
-    async def _get_group_label_and_aria(self, element) -> Tuple[Optional[str], Optional[str]]:
-        """Get group label and aria-labelledby information"""
-        try:
-            result = await element.evaluate('''
-                el => {
-                    let group = el.closest("fieldset, [role='group']");
-                    let aria_labelledby = null;
-                    let label_text = null;
-                    if (group) {
-                        let legend = group.querySelector("legend");
-                        if (legend && legend.textContent) label_text = legend.textContent.trim();
-                        let labelledby = group.getAttribute("aria-labelledby");
-                        if (labelledby) {
-                            aria_labelledby = labelledby;
-                            let labelEl = document.getElementById(labelledby);
-                            if (labelEl && labelEl.textContent) label_text = labelEl.textContent.trim();
-                        }
-                        if (!label_text) {
-                            let label = group.querySelector("label");
-                            if (label && label.textContent) label_text = label.textContent.trim();
-                        }
-                    }
-                    if (!label_text) {
-                        let cur = el.parentElement;
-                        let depth = 0;
-                        while (cur && depth < 15) {
-                            let labelledby = cur.getAttribute && cur.getAttribute("aria-labelledby");
-                            if (labelledby) {
-                                aria_labelledby = labelledby;
-                                let labelEl = document.getElementById(labelledby);
-                                if (labelEl && labelEl.textContent) {
-                                    label_text = labelEl.textContent.trim();
-                                    break;
-                                }
-                            }
-                            cur = cur.parentElement;
-                            depth++;
-                        }
-                    }
-                    return {label_text, aria_labelledby};
-                }
-            ''')
-            return result.get('label_text'), result.get('aria_labelledby')
-        except:
-            return None, None
-
-    async def _get_element_options(self, input_el, input_tag: str, input_type: str) -> Optional[List[str]]:
-        """Get options for dropdown/select elements"""
+            info = {'question': None, 'group_label': None, 'aria_labelledby': None}
+        self._label_cache[element] = info['question']
+        self._group_cache[element] = (info['group_label'], info['aria_labelledby'])
+        return info
+
+    async def _get_snapshot_options(self, input_el, info: Dict[str, Any], input_tag: str, input_type: str) -> Optional[List[str]]:
+        """Use the options from an _snapshot_inputs record, opening the listbox only when it had none"""
+        if info['options'] is not None:
+            return info['options']
+        return await self._get_element_options(input_el, input_tag, input_type, info)
+
+    async def _get_element_options(self, input_el, input_tag: str, input_type: str,
+                                   info: Optional[Dict[str, Any]] = None) -> Optional[List[str]]:
+        """Get options for dropdown/select elements
+        
+        Args:
+            info: The element's _snapshot_inputs record; its role/aria-haspopup are read from the page when not given
+        """
         try:
             options = None
             
-            if input_tag == "button" or await input_el.get_attribute('role') == 'combobox':
-                aria_haspopup = await input_el.get_attribute('aria-haspopup')
+            role = info['role'] if info else await input_el.get_attribute('role')
+            if input_tag == "button" or role == 'combobox':
+                aria_haspopup = info['aria_haspopup'] if info else await input_el.get_attribute('aria-haspopup')
                 if aria_haspopup == "listbox":
-                    options = await self._get_listbox_options(input_el)
+                    options = await self._get_listbox_options(input_el, info)
             
             return options
         except:
             return None
 
-    async def _get_listbox_options(self, input_el) -> List[str]:
-        """Extract options from a listbox by clicking it"""
+    async def _get_listbox_options(self, input_el, info: Optional[Dict[str, Any]] = None) -> List[str]:
+        """Extract options from a listbox by clicking it, once per listbox until the next fill
+        
+        Cached by the snapshot's ids plus aria_labelledby, which keeps the same automation id
+        in repeated panels apart; without a snapshot record the options are not cached.
+        """
+        cache_key = (info['element_id'], info['input_id'], info['aria_labelledby']) if info else None
+        if cache_key and cache_key in self._listbox_options_cache:
+            return self._listbox_options_cache[cache_key]
+        
+        # Only one listbox can be open at a time, so concurrent extractions take turns here
+        async with self._listbox_lock:
+            options = await self._read_listbox_options(input_el)
+        # An empty read is more likely a popup that failed to open than a listbox with no options
+        if cache_key and options:
+            self._listbox_options_cache[cache_key] = options
+        return options
+
+    async def _read_listbox_options(self, input_el) -> List[str]:
+        """Open a listbox, read its options and close it again"""
         try:
             await input_el.click()
-            await asyncio.sleep(1)
+            await self._wait_for_selector_quietly(f'{OPEN_LISTBOX_SELECTOR} li[role="option"]')
             
             options = []
-            listbox_container = await self.page.query_selector('div[visibility="opened"]')
+            listbox_container = await self.page.query_selector(OPEN_LISTBOX_SELECTOR)
             
             if listbox_container:
                 li_elements = await listbox_container.query_selector_all('li[role="option"]')
@@ -1659,102 +2318,21 @@ class JobApplicationBot:
                                 options.append(nested_text.strip())
 
             await input_el.click()  # Close the dropdown
-            await asyncio.sleep(0.5)
+            await self._wait_for_selector_quietly(OPEN_LISTBOX_SELECTOR, state='detached', timeout=1000)
             return options
         except:
             return []
 
-    async def _get_radio_option_label(self, radio_element) -> str:
-        """Get the specific option label for a radio button (not the group label)"""
+    async def _get_radio_option_label(self, radio_element, info: Optional[Dict[str, Any]] = None) -> str:
+        """Get the specific option label for a radio button (not the group label)
+        
+        Args:
+            info: The radio's _snapshot_inputs record; read with one evaluate when not given
+        """
         try:
-            # Method 1: Check for direct label associated with this specific radio
-            # This is the most reliable method for the Workday structure
-            radio_id = await radio_element.get_attribute('id')
-            if radio_id:
-                # Look for label with for attribute pointing to this radio
-                specific_label = await self.page.query_selector(f'label[for="{radio_id}"]')
-                if specific_label:
-                    label_text = await specific_label.inner_text()
-                    if label_text and label_text.strip():
-                        print(f"Found radio option label by ID '{radio_id}': {label_text.strip()}")
-                        return label_text.strip()
-            
-            # Method 2: Look for nearby label in the same radio container
-            # This handles cases where the structure is slightly different
-            container_label = await radio_element.evaluate("""
-                (element) => {
-                    // Look for a label element in the same immediate container
-                    let parent = element.parentElement;
-                    if (parent) {
-                        // First check immediate parent for label
-                        let label = parent.querySelector('label:not([id])');
-                        if (label && label.textContent && label.textContent.trim()) {
-                            return label.textContent.trim();
-                        }
-                        
-                        // Check parent's parent (one level up)
-                        let grandParent = parent.parentElement;
-                        if (grandParent) {
-                            let grandLabel = grandParent.querySelector('label:not([id])');
-                            if (grandLabel && grandLabel.textContent && grandLabel.textContent.trim()) {
-                                return grandLabel.textContent.trim();
-                            }
-                        }
-                    }
-                    return '';
-                }
-            """)
-            
-            if container_label and container_label.strip():
-                print(f"Found radio option label by container: {container_label.strip()}")
-                return container_label.strip()
-            
-            # Method 3: Look for text in sibling elements
-            try:
-                sibling_text = await radio_element.evaluate("""
-                    (element) => {
-                        const nextSibling = element.nextElementSibling;
-                        if (nextSibling && nextSibling.textContent) {
-                            let text = nextSibling.textContent.trim();
-                            if (text && text.length < 50) {
-                                return text;
-                            }
-                        }
-                        
-                        const prevSibling = element.previousElementSibling;
-                        if (prevSibling && prevSibling.textContent) {
-                            let text = prevSibling.textContent.trim();
-                            if (text && text.length < 50) {
-                                return text;
-                            }
-                        }
-                        
-                        return '';
-                    }
-                """)
-                
-                if sibling_text and len(sibling_text) < 50:
-                    print(f"Found radio option label by sibling: {sibling_text}")
-                    return sibling_text
-                    
-            except:
-                pass
-            
-            # Method 4: Get value attribute as fallback
-            value = await radio_element.get_attribute('value')
-            if value and value != 'on':
-                # Convert common values to readable text
-                if value.lower() == 'true':
-                    return 'Yes'
-                elif value.lower() == 'false':
-                    return 'No'
-                else:
-                    print(f"Found radio option label by value: {value}")
-                    return value
-                
-            print(f"Could not find radio option label, using fallback")
-            return "Unknown Option"
-            
+            if info is None:
+                info = await self._read_labels(radio_element)
+            return info.get('option_label') or "Unknown Option"
         except Exception as e:
             print(f"Error getting radio option label: {e}")
             return "Unknown Option"
@@ -1767,7 +2345,7 @@ class JobApplicationBot:
                 element_info = key_mapping[full_key]
                 
                 try:
-                    print(f"Filling element {element_info['input_id']} with response: {response_value}")
+                    log.debug("Filling element %s with response: %s", element_info['input_id'], response_value)
                     
                     # Handle radio groups
                     if element_info['input_type'] == 'radio_group':
@@ -1789,6 +2367,7 @@ class JobApplicationBot:
 
     async def _fill_radio_group(self, radio_group_info: Dict[str, Any], response_value: str) -> None:
         """Fill a radio button group by selecting the appropriate option"""
+        self._listbox_options_cache.clear()
         try:
             question = radio_group_info.get('question', 'Unknown radio group')
             input_id = radio_group_info.get('input_id', 'radio_group')
@@ -1798,7 +2377,7 @@ class JobApplicationBot:
                 self._start_question_timing(question, input_id)
             
             if response_value == "SKIP":
-                print(f"Skipping radio group {input_id} as per AI response")
+                log.debug("Skipping radio group %s as per AI response", input_id)
                 # End timing for skipped questions
                 if question and question != "UNLABELED":
                     self._end_question_timing(question, input_id, "SKIP")
@@ -1818,36 +2397,23 @@ class JobApplicationBot:
                     "required": radio_group_info.get('required'),
                     "role": "radiogroup"
                 }
-                self.extracted_elements.append(element_data)
+                self._record_element("extracted", element_data)
                 
                 # Log filled element info (with response)
                 filled_data = element_data.copy()
                 filled_data["response_filled"] = response_value
-                self.filled_elements.append(filled_data)
-                print(f"Recorded radio group data: {question} -> {response_value}")
+                self._record_element("filled", filled_data)
+                log.info("Recorded radio group data: %s -> %s", question, response_value)
             
             options = radio_group_info['options']
             elements = radio_group_info['elements']
             
-            print(f"Radio group question: {radio_group_info['question']}")
-            print(f"Available options: {options}")
-            print(f"AI selected: {response_value}")
-            
-            # Find the matching option
-            selected_index = -1
-            
-            # First try exact match
-            for i, option in enumerate(options):
-                if option.lower().strip() == response_value.lower().strip():
-                    selected_index = i
-                    break
+            log.debug("Radio group question: %s", radio_group_info['question'])
+            log.debug("Available options: %s", options)
+            log.debug("AI selected: %s", response_value)
             
-            # If no exact match, try partial match
-            if selected_index == -1:
-                for i, option in enumerate(options):
-                    if response_value.lower().strip() in option.lower().strip() or option.lower().strip() in response_value.lower().strip():
-                        selected_index = i
-                        break
+            # Find the matching option: exact first, then partial
+            selected_index = _match_option_index(options, response_value)
             
             # If still no match, use first option as fallback
             if selected_index == -1:
@@ -1860,7 +2426,7 @@ class JobApplicationBot:
                 selected_option = options[selected_index]
                 
                 await selected_element.check()
-                print(f"Selected radio option: '{selected_option}'")
+                log.info("Selected radio option: '%s'", selected_option)
                 
                 # End timing for successful radio group selection
                 if question and question != "UNLABELED":
@@ -1928,16 +2494,18 @@ class JobApplicationBot:
 
     async def _fill_single_element(self, input_el, input_id: str, input_type: str, input_tag: str, response: Any, options: Optional[List[str]] = None, question: str = None) -> None:
         """Fill a single form element"""
+        self._listbox_options_cache.clear()
         try:
             # Start timing for this question if we have a valid question
             if question and question != "UNLABELED":
                 self._start_question_timing(question, input_id)
             
-            # Get complete element information for logging
-            group_label, aria_labelledby = await self._get_group_label_and_aria(input_el)
-            placeholder = await input_el.get_attribute('placeholder')
-            required = await input_el.get_attribute('required')
-            role = await input_el.get_attribute('role')
+            # Get complete element information for logging; the snapshot record has it all
+            info = self._info_cache.get(input_el) or await self._read_labels(input_el)
+            aria_labelledby = info['aria_labelledby']
+            placeholder = info.get('placeholder')
+            required = info.get('required')
+            role = info.get('role')
             
             # Log extracted element info
             element_data = {
@@ -1951,17 +2519,17 @@ class JobApplicationBot:
                 "required": required,
                 "role": role
             }
-            self.extracted_elements.append(element_data)
+            self._record_element("extracted", element_data)
             
             # Log filled element info (with response)
             if response != "SKIP" and question and question != "UNLABELED":
                 filled_data = element_data.copy()
                 filled_data["response_filled"] = response
-                self.filled_elements.append(filled_data)
-                print(f"Recorded data: {question} -> {response}")
+                self._record_element("filled", filled_data)
+                log.info("Recorded data: %s -> %s", question, response)
             
             if response == "SKIP":
-                print(f"Skipping input {input_id} as per AI response")
+                log.debug("Skipping input %s as per AI response", input_id)
                 # End timing even for skipped questions
                 if question and question != "UNLABELED":
                     self._end_question_timing(question, input_id, "SKIP")
@@ -1971,27 +2539,11 @@ class JobApplicationBot:
             if input_tag == "input" and input_type == "file" and isinstance(response, str):
                 if os.path.exists(response):
                     await input_el.set_input_files([response])
-                    print(f"Uploaded file: {response}")
+                    log.info("Uploaded file: %s", response)
                 return
 
-            # Check if element is inside a multiSelectContainer
-            is_multi_select = await input_el.evaluate('''
-                el => {
-                    let cur = el.parentElement;
-                    let depth = 0;
-                    while (cur && depth < 10) {
-                        if (cur.getAttribute("data-automation-id")?.includes("multiSelectContainer")) {
-                            return true;
-                        }
-                        cur = cur.parentElement;
-                        depth++;
-                    }
-                    return false;
-                }
-            ''')
-
-            # Handle multi-select containers (skills, etc.)
-            if is_multi_select:
+            # Handle multi-select containers (skills, etc.), as found by the snapshot
+            if info.get('multi_select'):
                 await self._fill_multi_select_element(input_el, input_id, response)
                 return
 
@@ -2000,11 +2552,11 @@ class JobApplicationBot:
                 if isinstance(response, list):
                     response = ", ".join(response)
                 await input_el.fill(str(response))
-                print(f"Filled {input_id} with: {response}")
+                log.info("Filled %s with: %s", input_id, response)
                 return
 
             # Handle listbox/dropdown elements
-            if input_tag == "button" or await input_el.get_attribute('role') == 'combobox':
+            if input_tag == "button" or role == 'combobox':
                 await self._fill_listbox_element(input_el, response)
                 return
 
@@ -2012,14 +2564,14 @@ class JobApplicationBot:
             if input_type == "radio":
                 if response in [True, "true", "yes", "Yes", 1]:
                     await input_el.check()
-                    print(f"Selected radio button {input_id}")
+                    log.info("Selected radio button %s", input_id)
                 else:
-                    print(f"Skipping radio button {input_id} as response is not affirmative")
+                    log.debug("Skipping radio button %s as response is not affirmative", input_id)
                 return
 
             # Handle checkboxes
             if input_type == "checkbox":
-                print("Inside fill single element handling the checkbox")
+                log.debug("Filling checkbox %s", input_id)
                 normalized = str(response).strip().lower()
                 truthy_values = {"true", "yes", "1", "y", "on"}
                 falsy_values = {"false", "no", "0", "n", "off"}
@@ -2045,7 +2597,7 @@ class JobApplicationBot:
                             # Verify the change worked
                             new_state = await input_el.is_checked()
                             if new_state == desired_state:
-                                print(f"{'Checked' if desired_state else 'Unchecked'} checkbox {input_id}")
+                                log.debug("%s checkbox %s", 'Checked' if desired_state else 'Unchecked', input_id)
                                 break
                         except Exception as retry_error:
                             print(f"Attempt {attempt+1} failed: {retry_error}")
@@ -2053,7 +2605,7 @@ class JobApplicationBot:
                     else:
                         print(f"Warning: Failed to {'check' if desired_state else 'uncheck'} checkbox {input_id} after {max_retries} attempts")
                 else:
-                    print(f"Checkbox {input_id} already in desired state: {desired_state}")
+                    log.debug("Checkbox %s already in desired state: %s", input_id, desired_state)
                 return
 
             # Handle spinbutton (number inputs)
@@ -2061,7 +2613,7 @@ class JobApplicationBot:
                 if isinstance(response, str) and response.isdigit():
                     response = int(response)
                 await input_el.fill(str(response))
-                print(f"Filled spinbutton {input_id} with: {response}")
+                log.info("Filled spinbutton %s with: %s", input_id, response)
                 return
 
             print(f"Unhandled element type: {input_tag}/{input_type} for {input_id}")
@@ -2082,7 +2634,7 @@ class JobApplicationBot:
             if not isinstance(response, list):
                 response = [response] if response else []
 
-            print(f"Filling MultiInputContainer for {input_id} with responses: {response}")
+            log.debug("Filling MultiInputContainer for %s with responses: %s", input_id, response)
 
             # Get the container
             container_handle = await input_el.evaluate_handle('''
@@ -2108,25 +2660,26 @@ class JobApplicationBot:
             # Determine if this is a nested multi-level field (like "how did you hear")
             question = await self._get_nearest_label_text(input_el)
             is_nested_field = any(keyword in question.lower() for keyword in ["hear", "source", "referral"])
-            print("It is nested field:") if is_nested_field else print("It is single")
+            log.debug("Multi-select %s is %s", input_id, "nested" if is_nested_field else "single-level")
             
             # Add each item
             for item in response:
                 try:
-                    print(f"Adding item: {item}")
+                    log.debug("Adding item: %s", item)
                     
-                    # Click the container to focus
+                    # Click the container to focus (fill waits for the input to be editable)
                     await container.click()
-                    await asyncio.sleep(0.5)
                     
                     # Clear any existing text and type the item
                     await input_el.fill("")
-                    await asyncio.sleep(0.5)
                     await input_el.fill(str(item))
                                         
-                    # Press Enter to trigger dropdown
+                    # Options the container click already opened also match the option selector,
+                    # so remember them and wait for the search results to replace them
+                    before = await self._prompt_options_state()
                     await input_el.press('Enter')
-                    await asyncio.sleep(2)
+                    if not await self._wait_for_new_prompt_options(before):
+                        print(f"Search results for '{item}' did not appear within 5s")
 
                     if is_nested_field:
                         # Handle nested multi-level dropdown (like "how did you hear about us")
@@ -2135,7 +2688,7 @@ class JobApplicationBot:
                         # Handle single-level dropdown (like skills)
                         await self._handle_single_dropdown(item)
 
-                    print(f"Successfully added item: {item}")
+                    log.info("Successfully added item: %s", item)
 
                 except Exception as e:
                     print(f"Error adding item '{item}': {e}")
@@ -2144,48 +2697,89 @@ class JobApplicationBot:
         except Exception as e:
             print(f"Error filling multi-select element {input_id}: {e}")
 
+    async def _prompt_options_state(self) -> Tuple[Any, str]:
+        """The first prompt option node currently shown (or None) and all option texts, for _wait_for_new_prompt_options"""
+        first, texts = await asyncio.gather(
+            self.page.query_selector(PROMPT_OPTION_SELECTOR),
+            self.page.eval_on_selector_all(PROMPT_OPTION_SELECTOR, 'els => els.map(el => el.textContent || "").join("\\n")')
+        )
+        return first, texts
+
+    async def _wait_for_new_prompt_options(self, before: Tuple[Any, str], timeout: int = 5000) -> bool:
+        """Wait until the prompt shows options that replaced those in `before`
+        
+        Replaced means the old first node detached or the option texts changed; with no options
+        before, any non-empty list counts. Returns False on timeout.
+        """
+        first, texts = before
+        try:
+            await self.page.wait_for_function(
+                """([selector, first, before]) => {
+                    const texts = Array.from(document.querySelectorAll(selector), el => el.textContent || "");
+                    if (!texts.length || texts.every(text => !text)) return false;
+                    return !first || !first.isConnected || texts.join("\\n") !== before;
+                }""",
+                arg=[PROMPT_OPTION_SELECTOR, first, texts],
+                timeout=timeout
+            )
+            return True
+        except PlaywrightTimeoutError:
+            return False
+        finally:
+            if first is not None:
+                await first.dispose()
+
+    async def _read_prompt_options(self) -> Tuple[Locator, List[str]]:
+        """The open prompt's leaf options as a locator, with all their texts read in one evaluate
+        
+        Options are clicked through the locator's nth(), which re-resolves and auto-waits,
+        so no element handles are held across the scoring.
+        """
+        texts = await self.page.eval_on_selector_all(PROMPT_OPTION_SELECTOR, 'els => els.map(el => el.textContent || "")')
+        return self.page.locator(PROMPT_OPTION_SELECTOR), texts
+
     async def _handle_single_dropdown(self, item: str) -> None:
         """Handle single-level dropdown (like skills)"""
-        prompt_options = await self.page.query_selector_all('div[data-automation-id="promptLeafNode"]')
+        prompt_options, option_texts = await self._read_prompt_options()
         
-        if prompt_options:
-            print(f"Found {len(prompt_options)} options for '{item}':")
+        if option_texts:
+            log.debug("Found %s options for '%s':", len(option_texts), item)
             
             # Find the best matching option
-            best_match = None
+            best_index = None
             best_score = 0
             item_lower = str(item).lower()
             
-            for opt in prompt_options:
-                option_text = await opt.text_content()
+            for index, option_text in enumerate(option_texts):
                 option_lower = option_text.lower().strip()
-                print(f"  - {option_text}")
+                log.debug("  - %s", option_text)
                 
                 # Calculate match score
                 if option_lower == item_lower:
-                    best_match = opt
+                    best_index = index
                     best_score = 100
                     break
                 elif item_lower in option_lower or option_lower in item_lower:
                     score = len(item_lower) / len(option_lower) * 100
                     if score > best_score:
-                        best_match = opt
+                        best_index = index
                         best_score = score
             
             # Click the best match or first option if no good match
-            selected_option = best_match if best_match else prompt_options[0]
-            selected_text = await selected_option.text_content()
+            selected_index = best_index if best_index is not None else 0
+            selected_option = prompt_options.nth(selected_index)
+            selected_text = option_texts[selected_index]
             
-            checkbox_inside = await selected_option.query_selector('input[type="checkbox"]')
-            if checkbox_inside:
+            checkbox_inside = selected_option.locator('input[type="checkbox"]').first
+            if await checkbox_inside.count():
                 if(await checkbox_inside.is_checked()):
-                    print(f"Checkbox already checked for option: {selected_text}")
+                    log.debug("Checkbox already checked for option: %s", selected_text)
                 else:
                     await checkbox_inside.check()
-                    print(f"Checked checkbox for option: {selected_text}")
+                    log.info("Checked checkbox for option: %s", selected_text)
             else:
                 await selected_option.click()
-            print(f"Selected: '{selected_text}' (score: {best_score:.1f})")
+            log.info("Selected: '%s' (score: %.1f)", selected_text, best_score)
             await asyncio.sleep(1)
         else:
             print(f"No dropdown options found for '{item}'")
@@ -2193,80 +2787,82 @@ class JobApplicationBot:
     async def _handle_nested_dropdown(self, item: str) -> None:
         """Handle nested multi-level dropdown (like 'how did you hear about us')"""
         # First level dropdown
-        first_level_options = await self.page.query_selector_all('div[data-automation-id="promptLeafNode"]')
+        first_level_options, first_level_texts = await self._read_prompt_options()
         
-        if first_level_options:
-            print(f"Found {len(first_level_options)} first-level options for '{item}':")
+        if first_level_texts:
+            log.debug("Found %s first-level options for '%s':", len(first_level_texts), item)
             
             # Find best match for first level
-            best_first_match = None
+            best_first_index = None
             best_first_score = 0
             item_lower = str(item).lower()
             
-            for opt in first_level_options:
-                option_text = await opt.text_content()
+            for index, option_text in enumerate(first_level_texts):
                 option_lower = option_text.lower().strip()
-                print(f"  Level 1: {option_text}")
+                log.debug("  Level 1: %s", option_text)
                 
                 # Map common terms to first-level categories
                 if any(term in item_lower for term in ['linkedin', 'facebook', 'twitter', 'instagram']) and 'social' in option_lower:
-                    best_first_match = opt
+                    best_first_index = index
                     best_first_score = 90
                     break
                 elif any(term in item_lower for term in ['indeed', 'glassdoor', 'monster', 'job']) and 'job' in option_lower:
-                    best_first_match = opt
+                    best_first_index = index
                     best_first_score = 90
                     break
                 elif any(term in item_lower for term in ['friend', 'colleague', 'referral']) and any(ref_term in option_lower for ref_term in ['referral', 'friend', 'colleague']):
-                    best_first_match = opt
+                    best_first_index = index
                     best_first_score = 90
                     break
                 elif item_lower in option_lower or option_lower in item_lower:
                     score = len(item_lower) / len(option_lower) * 100
                     if score > best_first_score:
-                        best_first_match = opt
+                        best_first_index = index
                         best_first_score = score
             
             # Click first level option
-            first_selected = best_first_match if best_first_match else first_level_options[0]
-            first_selected_text = await first_selected.text_content()
+            first_index = best_first_index if best_first_index is not None else 0
+            first_selected_text = first_level_texts[first_index]
             
-            await first_selected.click()
-            print(f"Selected first level: '{first_selected_text}'")
-            await asyncio.sleep(1.5)  # Wait for second level to load
+            before = await self._prompt_options_state()
+            await first_level_options.nth(first_index).click()
+            log.info("Selected first level: '%s'", first_selected_text)
+            
+            # Wait for the second level to replace the first-level options
+            if not await self._wait_for_new_prompt_options(before):
+                print("Second-level options did not change within 5s")
             
             # Second level dropdown
-            second_level_options = await self.page.query_selector_all('div[data-automation-id="promptLeafNode"]')
+            second_level_options, second_level_texts = await self._read_prompt_options()
             
-            if second_level_options:
-                print(f"Found {len(second_level_options)} second-level options:")
+            if second_level_texts:
+                log.debug("Found %s second-level options:", len(second_level_texts))
                 
                 # Find best match for second level
-                best_second_match = None
+                best_second_index = None
                 best_second_score = 0
                 
-                for opt in second_level_options:
-                    option_text = await opt.text_content()
+                for index, option_text in enumerate(second_level_texts):
                     option_lower = option_text.lower().strip()
-                    print(f"  Level 2: {option_text}")
+                    log.debug("  Level 2: %s", option_text)
                     
                     # Calculate match score for second level
                     if option_lower == item_lower:
-                        best_second_match = opt
+                        best_second_index = index
                         best_second_score = 100
                         break
                     elif item_lower in option_lower or option_lower in item_lower:
                         score = len(item_lower) / len(option_lower) * 100
                         if score > best_second_score:
-                            best_second_match = opt
+                            best_second_index = index
                             best_second_score = score
                 
                 # Click second level option
-                second_selected = best_second_match if best_second_match else second_level_options[0]
-                second_selected_text = await second_selected.text_content()
+                second_index = best_second_index if best_second_index is not None else 0
+                second_selected_text = second_level_texts[second_index]
                 
-                await second_selected.click()
-                print(f"Selected second level: '{second_selected_text}' (score: {best_second_score:.1f})")
+                await second_level_options.nth(second_index).click()
+                log.info("Selected second level: '%s' (score: %.1f)", second_selected_text, best_second_score)
                 await asyncio.sleep(1)
             else:
                 print("No second-level options found")
@@ -2276,30 +2872,17 @@ class JobApplicationBot:
     async def _fill_listbox_element(self, input_el, response: str) -> None:
         """Fill a listbox/combobox element"""
         try:
-            await asyncio.sleep(0.1)
             await input_el.click()
-            await asyncio.sleep(0.7)
-            
-            listbox = await self.page.query_selector('div[visibility="opened"]')
-            if listbox:
-                li_elements = await listbox.query_selector_all('li')
-                for li in li_elements:
-                    text = await li.text_content()
-                    if text and (text.lower() == response.lower() or response.lower() in text.lower()):
-                        await li.click()
-                        print(f"Selected option: {text}")
-                        await asyncio.sleep(0.5)
-                        return True
-                        
-                    # Check nested div elements
-                    div_element = await li.query_selector('div')
-                    if div_element:
-                        div_text = await div_element.text_content()
-                        if div_text and response.lower() in div_text.lower():
-                            await li.click()
-                            print(f"Selected option: {div_text}")
-                            await asyncio.sleep(0.2)
-                            return True
+            await self._wait_for_selector_quietly(OPEN_LISTBOX_OPTION_SELECTOR)
+            
+            # has_text matches the li's text (nested divs included) case-insensitively inside the page;
+            # the click auto-waits for the option to be actionable
+            match = self.page.locator(OPEN_LISTBOX_SELECTOR).first.locator('li', has_text=str(response)).first
+            if await match.count():
+                await match.click()
+                log.info("Selected option matching: %s", response)
+                await self._wait_for_selector_quietly(OPEN_LISTBOX_SELECTOR, state='detached', timeout=1000)
+                return True
             
             print(f"Could not find option '{response}' in dropdown")
             return False
@@ -2311,21 +2894,21 @@ class JobApplicationBot:
     async def submit_form(self) -> bool:
         """Submit the current form"""
         try:
-            # Look for submit/continue button
-            submit_selectors = [
-                'button[data-automation-id="pageFooterNextButton"]',
-                'button[aria-label*="Save and Continue"]',
-                'button[aria-label*="Submit"]',
+            # Look for submit/continue button with one selector union (single round-trip)
+            submit_selector = (
+                'button[data-automation-id="pageFooterNextButton"], '
+                'button[aria-label*="Save and Continue"], '
+                'button[aria-label*="Submit"], '
                 'button[aria-label*="Next"]'
-            ]
+            )
             
-            for selector in submit_selectors:
-                submit_btn = await self.page.query_selector(selector)
-                if submit_btn:
-                    await submit_btn.click()
-                    print(f"Clicked submit button: {selector}")
-                    await asyncio.sleep(5)
-                    return True
+            submit_btn = await self.page.query_selector(submit_selector)
+            if submit_btn:
+                # Workday submits over XHR without a navigation, so wait for the POST and the step change
+                await self._click_and_wait_for_submit(submit_btn)
+                print("Clicked submit button")
+                await self._wait_for_page_ready()
+                return True
             
             print("No submit button found")
             return False
@@ -2334,10 +2917,27 @@ class JobApplicationBot:
             print(f"Error submitting form: {e}")
             return False
 
+    def _record_element(self, kind: str, element_data: Dict[str, Any]) -> None:
+        """Collect an extracted/filled element and append it to the run's JSONL log
+
+        The log is flushed per entry so the data captured so far survives a crash mid-run.
+        """
+        (self.extracted_elements if kind == "extracted" else self.filled_elements).append(element_data)
+        try:
+            if self._application_log is None:
+                self._application_log = open(self.current_run_dir / "application_data.jsonl", 'ab')
+            self._application_log.write(orjson.dumps({"kind": kind, "element": element_data}, default=str) + b"\n")
+            self._application_log.flush()
+        except Exception as e:
+            print(f"Error writing application log entry: {e}")
+
     def save_application_data(self) -> str:
         """Save collected application data to JSON files"""
         try:
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+            # The in-memory lists hold every entry even if a JSONL write failed; the log is only
+            # the crash-survival copy
+            extracted_elements, filled_elements = self.extracted_elements, self.filled_elements
             
             # Save extracted elements (all elements found)
             extracted_filename = f"{self.company}_extracted_elements_{timestamp}_run{self.run_number:03d}.json"
@@ -2348,12 +2948,11 @@ class JobApplicationBot:
                 "company": self.company,
                 "url" : self.url,
                 "run_number": self.run_number,
-                "total_extracted_elements": len(self.extracted_elements),
-                "extracted_elements": self.extracted_elements
+                "total_extracted_elements": len(extracted_elements),
+                "extracted_elements": extracted_elements
             }
             
-            with open(extracted_filepath, 'w', encoding='utf-8') as f:
-                json.dump(extracted_summary, f, indent=2, ensure_ascii=False)
+            _write_json(extracted_filepath, extracted_summary)
             
             # Save filled elements (elements with responses)
             filled_filename = f"{self.company}_filled_elements_{timestamp}_run{self.run_number:03d}.json"
@@ -2366,30 +2965,28 @@ class JobApplicationBot:
                 "timestamp": datetime.now().isoformat(),
                 "company": self.company,
                 "run_number": self.run_number,
-                "total_extracted_elements": len(self.extracted_elements),
-                "total_filled_elements": len(self.filled_elements),
+                "total_extracted_elements": len(extracted_elements),
+                "total_filled_elements": len(filled_elements),
                 "timing_profile": timing_summary,  # Add timing information
-                "extracted_elements": self.extracted_elements,
-                "filled_elements": self.filled_elements
+                "extracted_elements": extracted_elements,
+                "filled_elements": filled_elements
             }
             
             # Also save a separate timing report
             timing_filename = f"{self.company}_timing_profile_{timestamp}_run{self.run_number:03d}.json"
             timing_filepath = self.current_run_dir / timing_filename
             
-            with open(timing_filepath, 'w', encoding='utf-8') as f:
-                json.dump(timing_summary, f, indent=2, ensure_ascii=False)
+            _write_json(timing_filepath, timing_summary)
             
-            with open(filled_filepath, 'w', encoding='utf-8') as f:
-                json.dump(filled_summary, f, indent=2, ensure_ascii=False)
+            _write_json(filled_filepath, filled_summary)
             
             print(f"Extracted elements saved to: {extracted_filepath}")
             print(f"Filled elements saved to: {filled_filepath}")
             print(f"Timing profile saved to: {timing_filepath}")
             print(f"Company: {self.company}")
             print(f"Run number: {self.run_number}")
-            print(f"Total extracted elements: {len(self.extracted_elements)}")
-            print(f"Total filled elements: {len(self.filled_elements)}")
+            print(f"Total extracted elements: {len(extracted_elements)}")
+            print(f"Total filled elements: {len(filled_elements)}")
             print(f"Total questions with timing: {timing_summary['total_questions']}")
             if timing_summary['total_questions'] > 0:
                 print(f"Average time per question: {timing_summary['average_time_readable']}")
@@ -2401,8 +2998,97 @@ class JobApplicationBot:
             print(f"Error saving application data: {e}")
             return ""
 
+    async def close_context(self) -> None:
+        """Close this bot's context, persisting the session first if authentication succeeded"""
+        if self._application_log is not None:
+            self._application_log.close()
+            self._application_log = None
+        if not self.context:
+            return
+        if self.authenticated and self.storage_state_path:
+            try:
+                self.storage_state_path.parent.mkdir(parents=True, exist_ok=True)
+                await self.context.storage_state(path=str(self.storage_state_path))
+                print(f"Saved session state to: {self.storage_state_path}")
+            except Exception as e:
+                print(f"Error saving session state: {e}")
+        await self.context.close()
+        self.context = None
+        self.page = None
+
     async def close_browser(self) -> None:
         """Close the browser"""
+        await self.close_context()
+        if self.browser:
+            await self.browser.close()
+            print("Browser closed")
+
+
+class JobApplicationBotPool:
+    """Runs many applications on one shared browser, giving each job its own context"""
+
+    def __init__(self, max_concurrency: int = 3, headless: bool = False, slow_mo: int = 0,
+                 config_path: str = "data/user_profile_temp.json", cache_path: Optional[str] = None):
+        """Initialize the pool
+
+        Args:
+            max_concurrency: Maximum number of applications running at once
+            headless: Run the shared Chromium without a window
+            slow_mo: Delay in milliseconds added to every Playwright action
+            config_path: Path to user profile configuration file passed to every bot
+            cache_path: AI answer cache passed to every bot; None disables it
+        """
+        self.max_concurrency = max_concurrency
+        self.headless = headless
+        self.slow_mo = slow_mo
+        self.config_path = config_path
+        self.cache_path = cache_path
+        self.playwright_instance = None
+        self.browser: Optional[Browser] = None
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def start(self) -> None:
+        """Start Playwright and the shared browser"""
+        self.playwright_instance = await async_playwright().start()
+        self.browser = await JobApplicationBot.launch_chromium(self.playwright_instance, self.headless, self.slow_mo)
+
+    async def acquire(self, company: str, url: Optional[str] = None) -> JobApplicationBot:
+        """Create a bot for a company with a fresh context on the shared browser"""
+        bot = JobApplicationBot(self.config_path, cache_path=self.cache_path)
+        if url:
+            bot.custom_urls[company] = url
+        bot.set_company(company)
+        await bot.open_context(self.browser, bot.get_storage_state_path(company))
+        return bot
+
+    async def release(self, bot: JobApplicationBot) -> None:
+        """Close a bot's context (not the shared browser) to bound memory between jobs"""
+        try:
+            await bot.close_context()
+        except Exception as e:
+            print(f"Error closing context for {bot.company}: {e}")
+
+    async def run_all(self, jobs: List[Tuple[Any, ...]], job_fn) -> List[Any]:
+        """Run job_fn(bot, url, *args) for every (company, url, *args) job
+
+        At most max_concurrency jobs hold a context at once. Results are returned in
+        job order; exceptions are returned in place of results, as with asyncio.gather.
+        """
+        async def _run(company, url, *args):
+            async with self._semaphore:
+                bot = await self.acquire(company, url)
+                try:
+                    return await job_fn(bot, url, *args)
+                finally:
+                    await self.release(bot)
+
+        return await asyncio.gather(*(_run(*job) for job in jobs), return_exceptions=True)
+
+    async def close(self) -> None:
+        """Close the shared browser and stop Playwright"""
         if self.browser:
             await self.browser.close()
-            print("Browser closed")
\ No newline at end of file
+            self.browser = None
+        if self.playwright_instance:
+            await self.playwright_instance.stop()
+            self.playwright_instance = None
\ No newline at end of file
@@ -8,13 +8,30 @@ multiple application pages.
 """
 
 import asyncio
-from final import JobApplicationBot
+import itertools
+import logging
+import sys
+from playwright.async_api import Error as PlaywrightError, TimeoutError as PlaywrightTimeoutError
+from final import JobApplicationBot, SectionDispatch
+
+# Section processors keyed by keywords matched against a section's aria-labelledby;
+# the first matching entry wins, anything unmatched goes to the generic processor
+_DISPATCH = SectionDispatch([
+    (("work", "experience", "history"), "_process_experience_section"),
+    (("education",), "_process_education_section"),
+    (("language",), "_process_language_section"),
+    (("skill",), "_process_skills_section"),
+    (("resume", "document"), "_process_resume_section"),
+])
 
 
 async def process_application_sections(bot):
     """Process all sections on the current application page"""
-    await asyncio.sleep(10)
-    main_page = await bot.page.query_selector('div[data-automation-id="applyFlowPage"]')
+    # Returns as soon as the apply flow renders instead of after a fixed 10s
+    try:
+        main_page = await bot.page.wait_for_selector('div[data-automation-id="applyFlowPage"]', timeout=30000)
+    except PlaywrightTimeoutError:
+        main_page = None
     
     if not main_page:
         print("Main page container not found")
@@ -24,44 +41,24 @@ async def process_application_sections(bot):
 
     await bot._process_personal_information_section(main_page)
 
-    await asyncio.sleep(5)  # Wait for personal info section to process
+    await bot._wait_for_page_ready()  # Wait for personal info section to process
 
-    # Find all sections in the application
-    sections = await main_page.query_selector_all('div[role="group"][aria-labelledby]')
+    # Find all sections in the application; their labels come back in the same evaluate
+    # and are cached on each section so repeated attribute reads by the processors stay local
+    sections, labels = await bot._query_sections(main_page)
     print(f"Found {len(sections)} sections to process")
-    
-    
-    for section in sections:
-        aria_labelledby = await section.get_attribute('aria-labelledby')
-        if not aria_labelledby:
-            print("Section without aria-labelledby found, skipping")
-            continue
-
-        print(f"Processing section: {aria_labelledby}")
 
-
-    for section in sections:
-        aria_labelledby = await section.get_attribute('aria-labelledby')
+    for section, aria_labelledby in zip(sections, labels):
         if not aria_labelledby:
+            print("Section without aria-labelledby found, skipping")
             continue
 
         print(f"\n=== Processing section: {aria_labelledby} ===")
 
-        if any(keyword in aria_labelledby.lower() for keyword in ["work", "experience", "history"]):
-            print("Processing work experience section")
-            await bot._process_experience_section(section)
-        elif any(keyword in aria_labelledby.lower() for keyword in ["education"]):
-            print("Processing education section")
-            await bot._process_education_section(section)
-        elif any(keyword in aria_labelledby.lower() for keyword in ["language"]):
-            print("Processing language section")
-            await bot._process_language_section(section)
-        elif any(keyword in aria_labelledby.lower() for keyword in ["skill"]):
-            print("Processing skills section")
-            await bot._process_skills_section(section)
-        elif any(keyword in aria_labelledby.lower() for keyword in ["resume", "document"]):
-            print("Processing resume section")
-            await bot._process_resume_section(section)
+        label_lower = aria_labelledby.lower()
+        matched, method = _DISPATCH.match(label_lower)
+        if matched:
+            await getattr(bot, method)(section)
         else:
             print(f"Unknown section type: {aria_labelledby}")
             await bot._process_generic_section(section, aria_labelledby)
@@ -71,40 +68,32 @@ async def process_application_sections(bot):
 
 async def process_remaining_pages(bot):
     """Process remaining application pages until no more Next buttons are found"""
-    page_count = 1
-    
-    while True:
+    for page_count in itertools.count(1):
         print(f"\n=== Processing Page {page_count} ===")
         
-        # Check if there's a Next button on the current page
+        # Process sections on the new page
+        await bot._wait_for_page_ready()
         try:
-            
-            # Process sections on the new page
-            await asyncio.sleep(5)
-
             await bot._process_later_sections(bot.page)
-            
-            page_count += 1
-            
-            next_button = await bot.page.query_selector('button[data-automation-id="pageFooterNextButton"]')
-            
-            if not next_button:
-                print("No Next button found - reached the end of the application")
-                break
-            
-            # Check if the button is visible and enabled
-            is_visible = await next_button.is_visible()
-            
-            if not (is_visible):
-                print("Next button found but not clickable - reached the end of the application")
-                break
-            
-            print("Next button found, clicking to proceed to next page...")
-            await next_button.click()
-                        
         except Exception as e:
             print(f"Error processing page {page_count}: {str(e)}")
-            # Try to continue anyway
+            break
+        
+        # Returns as soon as the button is visible; a short timeout means the flow has ended
+        try:
+            next_button = await bot.page.wait_for_selector(
+                'button[data-automation-id="pageFooterNextButton"]',
+                state='visible', timeout=3000
+            )
+        except PlaywrightTimeoutError:
+            print("No visible Next button found - reached the end of the application")
+            break
+        
+        print("Next button found, clicking to proceed to next page...")
+        try:
+            await bot._click_and_wait_for_submit(next_button)
+        except PlaywrightError as e:
+            print(f"Error clicking Next on page {page_count}: {str(e)}")
             break
     
     print(f"Completed processing {page_count} pages total")
@@ -112,7 +101,7 @@ async def process_remaining_pages(bot):
 
 async def main():
     """Main function to run the job application automation"""
-    bot = JobApplicationBot()
+    bot = JobApplicationBot(cache_path=".ai_cache")
     
     try:
         # Get authentication choice
@@ -128,7 +117,7 @@ async def main():
 
         # Get company choice
         print("\nAvailable companies:")
-        company_list = list(bot.company_urls.keys())
+        company_list = list(bot.COMPANY_URLS.keys())
         for i, company in enumerate(company_list, 1):
             print(f"{i}. {company.title()}")
         print(f"{len(company_list) + 1}. Paste a new job URL")
@@ -143,9 +132,9 @@ async def main():
                     print("No URL provided, defaulting to Harris")
                     selected_company = "harris"
                 else:
-                    # Add the custom URL to the bot's company_urls
+                    # Add the custom URL to the bot's custom_urls
                     custom_company_name = "custom_job"
-                    bot.company_urls[custom_company_name] = custom_url
+                    bot.custom_urls[custom_company_name] = custom_url
                     selected_company = custom_company_name
                     print(f"Using custom job URL: {custom_url}")
             else:
@@ -167,28 +156,32 @@ async def main():
 
         # Initialize browser
         print("Initializing browser...")
-        await bot.initialize_browser(headless=False)
+        headless = "--headed" not in sys.argv
+        await bot.initialize_browser(headless=headless, storage_state=bot.get_storage_state_path(selected_company))
 
         # Navigate to job
         print(f"Navigating to {selected_company} job page...")
         await bot.navigate_to_job(selected_company)
 
-        # Handle authentication
-        print("Handling authentication...")
-        auth_success = await bot.handle_authentication(auth_choice)
-        if not auth_success:
-            print("Authentication failed, exiting...")
-            return
+        # Handle authentication, unless a restored session is already signed in
+        if await bot.is_signed_in():
+            print("Restored session is already signed in, skipping authentication")
+        else:
+            print("Handling authentication...")
+            auth_success = await bot.handle_authentication(auth_choice)
+            if not auth_success:
+                print("Authentication failed, exiting...")
+                return
 
-        print("Authentication successful!")
+            print("Authentication successful!")
 
-        await asyncio.sleep(10)  # Wait for page to load after authentication
+        await bot._wait_for_page_ready(timeout=30000)  # Wait for the form to render after authentication
 
         # Process the first page sections
         print("Processing initial application sections...")
         success = await process_application_sections(bot)
 
-        await asyncio.sleep(5)  # Wait for personal info section to process
+        await bot._wait_for_page_ready()  # Wait for personal info section to process
 
         if not success:
             print("Failed to process initial sections")
@@ -196,11 +189,16 @@ async def main():
 
         # Click the first Next button
         print("Looking for first Next button...")
-        next_button = await bot.page.query_selector('button[data-automation-id="pageFooterNextButton"]')
+        try:
+            next_button = await bot.page.wait_for_selector(
+                'button[data-automation-id="pageFooterNextButton"]',
+                state='visible', timeout=15000
+            )
+        except PlaywrightTimeoutError:
+            next_button = None
         if next_button:
             print("Clicking first Next button...")
-            await next_button.click()
-            await asyncio.sleep(5)
+            await bot._click_and_wait_for_submit(next_button)
         else:
             print("No Next button found on first page")
 
@@ -224,9 +222,12 @@ async def main():
         # Clean up browser resources
         if bot.browser:
             print("Cleaning up browser resources...")
-            await bot.browser.close()
+            await bot.close_browser()
 
 
 if __name__ == "__main__":
+    # Per-element form diagnostics are DEBUG; pass --verbose to see them
+    logging.basicConfig(format="%(message)s")
+    logging.getLogger("final").setLevel(logging.DEBUG if "--verbose" in sys.argv else logging.INFO)
     # Run the main function
     asyncio.run(main())
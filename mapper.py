@@ -8,25 +8,41 @@ Version: 1.0
 """
 
 import asyncio
-import json
+import atexit
+import hashlib
+import logging
 import os
+import time
 from typing import Dict, List, Any, Optional
 from datetime import datetime
 from pathlib import Path
 import traceback
+import httpx
 import openai
+import orjson
 from dotenv import load_dotenv
 import re
+import shelve
 
+log = logging.getLogger(__name__)
+
+
+_TRAILING_COMMA_RE = re.compile(r',(\s*[}\]])')
+
+# Most fields are selection/lookup; only open-ended prose goes to the larger model
+FAST_MODEL = "gpt-4o-mini"
+REASONING_MODEL = "gpt-4o"
+_FREE_TEXT_RE = re.compile(r"\b(describe|description|summary|summari[sz]e|why|explain|tell us|cover letter|motivation)\b")
 
 PROMPT_RULES = """
 You receive:
-USER_PROFILE (candidate JSON) and one FORM_ELEMENT (single field).
-Task: return SAME FORM_ELEMENT plus key "response". Output ONLY one JSON object.
+USER_PROFILE (candidate JSON) and FORM_ELEMENTS (JSON array of fields).
+Task: answer every FORM_ELEMENT. Output ONLY one JSON object: {"responses": [...]}.
 
 OUTPUT RULES:
-- Preserve all original keys/values unchanged; just add "response".
-- No markdown, no arrays unless rules require, no extra keys, no trailing commas.
+- "responses" has exactly one entry per FORM_ELEMENT, in the same order.
+- Each entry is the response value only; do not echo the element.
+- No markdown, no arrays inside an entry unless rules require, no extra keys, no trailing commas.
 - Use "SKIP" only if answering would be uninformed or risky.
 
 DECISION LOGIC ORDER:
@@ -56,34 +72,88 @@ Edge:
 - Prefer "No" over "N/A" unless truly not applicable.
 - Disability / veteran sets: pick privacy or neutral if present.
 
-Return only the updated JSON object with added "response".
+Return only the JSON object with the "responses" array.
 """.strip()
 
 
+# Part of every disk cache key; bump when PROMPT_RULES changes what an answer means
+MAPPER_CACHE_VERSION = 1
+
+# Disk-cached answers older than this are asked again, matching ai_handler's ANSWER_CACHE_TTL
+MAPPER_CACHE_TTL = 30 * 24 * 3600
+
+_MAPPER_CACHES: Dict[str, shelve.Shelf] = {}
+
+
+def _open_mapper_cache(path: str) -> shelve.Shelf:
+    """Open (once per process) the on-disk element answer cache at path"""
+    if path not in _MAPPER_CACHES:
+        cache = shelve.open(path, writeback=False)
+        atexit.register(cache.close)
+        _MAPPER_CACHES[path] = cache
+    return _MAPPER_CACHES[path]
+
+
 class ElementMapper:
     """Maps extracted form elements to AI-generated responses"""
     
-    def __init__(self, user_profile_path: str = "data/user_profile.json"):
-        """Initialize the mapper with user profile"""
+    def __init__(self, user_profile_path: str = "data/user_profile.json", cache_path: Optional[str] = ".mapper_cache",
+                 cache_ttl: float = MAPPER_CACHE_TTL):
+        """Initialize the mapper with user profile; cache_path=None disables the on-disk answer cache"""
         load_dotenv()
         self.user_profile_path = user_profile_path
         self.user_data = self._load_user_profile()
-        self.client = openai.AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        # The profile and rules are the same for every element, so the prompt prefix is built once
+        self._profile_json = orjson.dumps(self.user_data).decode()
+        self._prompt_prefix = f"{PROMPT_RULES}\n\nUSER_PROFILE:\n{self._profile_json}\n\nFORM_ELEMENTS:\n"
         self.max_concurrency = int(os.getenv("MAPPER_MAX_CONCURRENCY", "3"))
+        # One pooled HTTP/2 client so concurrent requests reuse connections instead of new handshakes
+        self._http_client = httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(max_connections=self.max_concurrency * 2,
+                                max_keepalive_connections=self.max_concurrency),
+            timeout=httpx.Timeout(60.0, connect=10.0)
+        )
+        self.client = openai.AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"), http_client=self._http_client)
+        self.batch_size = max(1, int(os.getenv("MAPPER_BATCH_SIZE", "5")))
+        # Identical elements recur across pages; answer each distinct one once per run
+        self._response_cache: Dict[str, Any] = {}
+        # Answers also persist across runs, namespaced by prompt version and profile
+        self.disk_cache = _open_mapper_cache(cache_path) if cache_path else None
+        self.cache_ttl = cache_ttl
+        self._cache_namespace = f"v{MAPPER_CACHE_VERSION}:".encode() + orjson.dumps(self.user_data, option=orjson.OPT_SORT_KEYS)
+    
+    async def close(self) -> None:
+        """Close the OpenAI client and its pooled HTTP connections"""
+        await self.client.close()
     
     def _load_user_profile(self) -> Dict[str, Any]:
         """Load user profile from JSON file"""
         try:
-            with open(self.user_profile_path, 'r') as f:
-                return json.load(f)
+            with open(self.user_profile_path, 'rb') as f:
+                return orjson.loads(f.read())
         except Exception as e:
             print(f"Error loading user profile: {e}")
             return {}
     
     def _sanitize_model_output(self, content: str) -> str:
+        """
+        Fast cleanup to turn model output into a JSON object: keeps the outer {...}
+        (which also drops fences and surrounding prose) and removes trailing commas.
+        """
+        if not content:
+            return "{}"
+        first_brace = content.find("{")
+        last_brace = content.rfind("}")
+        if first_brace != -1 and last_brace != -1:
+            content = content[first_brace:last_brace+1]
+        return _TRAILING_COMMA_RE.sub(r'\1', content).strip()
+    
+    def _strip_model_commentary(self, content: str) -> str:
         """
         Best-effort cleanup to turn model output into valid JSON object.
         Removes markdown fences, language tags, trailing commas, and commentary lines.
+        Only used when the fast sanitize pass does not yield parseable JSON.
         """
         if not content:
             return "{}"
@@ -114,88 +184,194 @@ class ElementMapper:
         if first_brace != -1 and last_brace != -1:
             content = content[first_brace:last_brace+1]
         # Remove trailing commas before } or ]
-        content = re.sub(r',(\s*[}\]])', r'\1', content)
+        content = _TRAILING_COMMA_RE.sub(r'\1', content)
         return content.strip()
     
-    async def _generate_single_element(self, element: Dict[str, Any]) -> Dict[str, Any]:
-        """Generate AI response for a single form element."""
+    async def _read_first_object(self, stream) -> str:
+        """Accumulate a streamed completion, closing the stream once the first JSON object is complete"""
+        parts: List[str] = []
+        depth = 0
+        opened = in_string = escaped = False
         try:
-            profile_min = json.dumps(self.user_data, separators=(",", ":"))
-            element_json = json.dumps(element, separators=(",", ":"))
+            async for chunk in stream:
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content or ""
+                parts.append(delta)
+                for ch in delta:
+                    if in_string:
+                        if escaped:
+                            escaped = False
+                        elif ch == "\\":
+                            escaped = True
+                        elif ch == '"':
+                            in_string = False
+                    elif ch == '"':
+                        in_string = opened
+                    elif ch == "{":
+                        depth += 1
+                        opened = True
+                    elif ch == "}" and opened:
+                        depth -= 1
+                if opened and depth == 0:
+                    break
+        finally:
+            await stream.close()
+        return "".join(parts)
+    
+    def _cache_key(self, element: Dict[str, Any]) -> str:
+        """Stable hash of an element (independent of key order) under the current prompt version and profile"""
+        return hashlib.blake2b(
+            self._cache_namespace + orjson.dumps(element, option=orjson.OPT_SORT_KEYS), digest_size=16
+        ).hexdigest()
+    
+    def _load_disk_answers(self, keys: List[str]) -> None:
+        """Copy any unexpired disk-cached answers for keys into the in-run cache"""
+        now = time.time()
+        for key in keys:
+            entry = self.disk_cache.get(key)
+            # Entries are (stored_at, response); anything else predates the TTL and is asked again
+            if isinstance(entry, tuple) and now - entry[0] < self.cache_ttl:
+                self._response_cache[key] = entry[1]
+    
+    def _store_disk_answers(self, answers: Dict[str, Any]) -> None:
+        """Persist newly mapped answers with the time they were stored"""
+        stored_at = time.time()
+        for key, response in answers.items():
+            self.disk_cache[key] = (stored_at, response)
+        self.disk_cache.sync()
+    
+    def _is_required(self, element: Dict[str, Any]) -> bool:
+        """The extracted 'required' is the raw attribute: "" when present, "true"/"false" from aria-required"""
+        required = element.get("required")
+        return required is not None and str(required).lower() != "false"
+    
+    def _needs_reasoning(self, element: Dict[str, Any]) -> bool:
+        """Free-text fields (textareas, describe/why prompts without options) need the larger model"""
+        if element.get("options"):
+            return False
+        if element.get("input_tag") == "textarea":
+            return True
+        return bool(_FREE_TEXT_RE.search(str(element.get("question", "")).lower()))
+    
+    async def _generate_batch(self, elements: List[Dict[str, Any]], model: str = FAST_MODEL) -> Dict[int, Any]:
+        """
+        Generate AI responses for several form elements in one request.
+        Returns {element index: response}; elements without a trustworthy answer are left out.
+        """
+        try:
+            elements_json = orjson.dumps(elements).decode()
             
             # question processing
-            print("Question :", element.get("question", "Unknown"))
+            for element in elements:
+                log.info("Question : %s", element.get("question", "Unknown"))
             
-            prompt = (
-                f"{PROMPT_RULES}\n\nUSER_PROFILE:\n{profile_min}\n\nFORM_ELEMENT:\n"
-                f"{element_json}\n"
-            )
+            prompt = self._prompt_prefix + elements_json + "\n"
 
-            response = await self.client.chat.completions.create(
-                model="gpt-4o",
+            # Only the response values come back, so the budget scales with the batch size
+            stream = await self.client.chat.completions.create(
+                model=model,
                 messages=[
                     {"role": "system", "content": "You output ONLY valid JSON objects. No markdown."},
                     {"role": "user", "content": prompt}
                 ],
                 temperature=0.1,
-                max_tokens=4000
+                max_tokens=min(4000, 300 * len(elements) + 200),
+                stream=True
             )
-            content = response.choices[0].message.content or ""
-            print("Raw AI response:", content)
+            content = await self._read_first_object(stream)
+            log.debug("Raw AI response: %s", content)
             raw = content
             content = self._sanitize_model_output(content)
-            print("Sanitized AI response:", content)
-
-            # Ensure it's an object (not array)
-            if content.strip().startswith('['):
-                # If model wrongly returned array, try first object
-                try:
-                    arr = json.loads(content)
-                    if isinstance(arr, list) and arr:
-                        parsed = arr[0]
-                    else:
-                        raise ValueError("Unexpected array structure")
-                except Exception:
-                    raise json.JSONDecodeError("Unexpected array output", content, 0)
-            else:
-                parsed = json.loads(content)
-
-            if not isinstance(parsed, dict):
-                raise ValueError("Model did not return JSON object")
+            log.debug("Sanitized AI response: %s", content)
 
-            # Guarantee original keys present
-            for k, v in element.items():
-                if k not in parsed:
-                    parsed[k] = v
+            try:
+                parsed = orjson.loads(content)
+            except orjson.JSONDecodeError:
+                # Comment or prose lines inside the object; fall back to the line-by-line cleanup
+                content = self._strip_model_commentary(raw)
+                log.debug("Re-sanitized AI response: %s", content)
+                parsed = orjson.loads(content)
 
-            if "response" not in parsed:
-                parsed["response"] = "SKIP"
+            if not isinstance(parsed, dict) or not isinstance(parsed.get("responses"), list):
+                raise ValueError("Model did not return a responses array")
 
-            return parsed
+            responses = parsed["responses"]
+            if len(responses) == len(elements):
+                return dict(enumerate(responses))
+            # Answers are matched to fields by position, so a wrong count means none can be trusted
+            log.warning("[batch] Expected %d responses, got %d", len(elements), len(responses))
+            if len(elements) == 1:
+                return {}
+            log.warning("[batch] Re-asking %d elements one at a time", len(elements))
+            answers = {}
+            for i, element in enumerate(elements):
+                single = await self._generate_batch([element], model)
+                if 0 in single:
+                    answers[i] = single[0]
+            return answers
 
         except Exception as e:
-            print(f"[single-element] Error: {e}")
-            # Fallback with SKIP
-            return {**element, "response": "SKIP"}
+            log.warning("[batch] Error: %s", e)
+            return {}
 
     async def generate_ai_responses(self, extracted_elements: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
-        Strictly sequential processing: one element at a time (no concurrency).
+        Map elements in batches of batch_size per request, at most max_concurrency requests in flight.
+        Each distinct element is asked once per run; results keep input order.
         """
-        results: List[Dict[str, Any]] = []
-        total = len(extracted_elements)
-        for i, el in enumerate(extracted_elements):
-            print(f"  -> Mapping element {i+1}/{total}")
-            res = await self._generate_single_element(el)
-            results.append(res)
-        return results
+        keys = [self._cache_key(el) for el in extracted_elements]
+        if self.disk_cache is not None:
+            # Shelve I/O runs off the event loop
+            await asyncio.to_thread(self._load_disk_answers, [k for k in set(keys) if k not in self._response_cache])
+        pending: Dict[str, Dict[str, Any]] = {}
+        for key, el in zip(keys, extracted_elements):
+            if key not in self._response_cache and key not in pending:
+                pending[key] = el
+        # Batch per model so each request goes to a single model
+        batches = []
+        for model in (FAST_MODEL, REASONING_MODEL):
+            group = [k for k in pending if (model == REASONING_MODEL) == self._needs_reasoning(pending[k])]
+            batches += [(group[i:i + self.batch_size], model) for i in range(0, len(group), self.batch_size)]
+        sem = asyncio.Semaphore(self.max_concurrency)
+        
+        async def _bounded(batch_keys: List[str], model: str) -> int:
+            async with sem:
+                responses = await self._generate_batch([pending[k] for k in batch_keys], model)
+                # A SKIP from the small model on a required field gets one retry on the larger model;
+                # optional fields (e.g. demographics) are legitimately skipped
+                retry = [i for i, k in enumerate(batch_keys)
+                         if responses.get(i, "SKIP") == "SKIP" and self._is_required(pending[k])]
+                if model == FAST_MODEL and retry:
+                    escalated = await self._generate_batch([pending[batch_keys[i]] for i in retry], REASONING_MODEL)
+                    responses.update((retry[i], response) for i, response in escalated.items())
+            # Failed or missing answers are not cached, so a later call or run asks again
+            for i, response in responses.items():
+                self._response_cache[batch_keys[i]] = response
+            return len(batch_keys)
+        
+        total = len(pending)
+        log.info("  -> %d repeated or cached elements, %d to map in %d requests",
+                 len(extracted_elements) - total, total, len(batches))
+        tasks = [asyncio.create_task(_bounded(b, model)) for b, model in batches]
+        # Progress in completion order; answers are looked up by key below, so input order is kept
+        done = 0
+        for task in asyncio.as_completed(tasks):
+            done += await task
+            log.info("  -> Mapped element %d/%d", done, total)
+        # SKIPs are kept for this run only, so a later run asks for those fields again
+        new_answers = {k: self._response_cache[k] for k in pending
+                       if k in self._response_cache and self._response_cache[k] != "SKIP"}
+        if self.disk_cache is not None and new_answers:
+            await asyncio.to_thread(self._store_disk_answers, new_answers)
+        return [{**el, "response": self._response_cache.get(key, "SKIP")} for key, el in zip(keys, extracted_elements)]
     
     async def process_extracted_elements_file(self, extracted_file_path: str) -> Dict[str, Any]:
         """Process an extracted elements JSON file and generate mapped responses"""
         try:
             # Load extracted elements
-            with open(extracted_file_path, 'r') as f:
-                extracted_data = json.load(f)
+            with open(extracted_file_path, 'rb') as f:
+                extracted_data = orjson.loads(f.read())
             
             # Extract the elements list
             elements = extracted_data.get('extracted_elements', [])
@@ -228,13 +404,19 @@ class ElementMapper:
             }
     
     def save_mapped_elements(self, mapped_data: Dict[str, Any], output_path: str) -> None:
-        """Save mapped elements to JSON file"""
+        """Save mapped elements to JSON file, atomically so a crash never leaves a partial file"""
         try:
-            # Ensure output directory exists
-            os.makedirs(os.path.dirname(output_path), exist_ok=True)
+            path = Path(output_path)
+            # Ensure output directory exists (a bare filename has parent '.')
+            path.parent.mkdir(parents=True, exist_ok=True)
             
-            with open(output_path, 'w') as f:
-                json.dump(mapped_data, f, indent=2)
+            tmp_path = path.with_suffix(path.suffix + '.tmp')
+            try:
+                with open(tmp_path, 'wb') as f:
+                    f.write(orjson.dumps(mapped_data, option=orjson.OPT_INDENT_2))
+                os.replace(tmp_path, path)
+            finally:
+                tmp_path.unlink(missing_ok=True)
             
             print(f"Mapped elements saved to: {output_path}")
             
@@ -262,7 +444,10 @@ async def main(extracted_elements_path: str, output_path: Optional[str] = None)
     
     # Process the file
     print(f"Processing: {extracted_elements_path}")
-    mapped_data = await mapper.process_extracted_elements_file(extracted_elements_path)
+    try:
+        mapped_data = await mapper.process_extracted_elements_file(extracted_elements_path)
+    finally:
+        await mapper.close()
     
     # Save results
     mapper.save_mapped_elements(mapped_data, str(output_path))
@@ -274,15 +459,29 @@ async def main(extracted_elements_path: str, output_path: Optional[str] = None)
 
 
 if __name__ == "__main__":
+    import logging.handlers
+    import queue
     import sys
     
-    if len(sys.argv) < 2:
-        print("Usage: python mapper.py <extracted_elements_path> [output_path]")
+    args = [a for a in sys.argv[1:] if a != "--verbose"]
+    if not args:
+        print("Usage: python mapper.py <extracted_elements_path> [output_path] [--verbose]")
         sys.exit(1)
     
-    extracted_path = sys.argv[1]
-    output_path = sys.argv[2] if len(sys.argv) > 2 else None
+    extracted_path = args[0]
+    output_path = args[1] if len(args) > 1 else None
+    
+    # Log records are handed to a background thread, so concurrent mapping tasks never block on stdout.
+    # Raw/sanitized model output is DEBUG; pass --verbose to see it
+    log_queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, logging.StreamHandler(sys.stdout))
+    logging.basicConfig(format="%(message)s", handlers=[logging.handlers.QueueHandler(log_queue)])
+    log.setLevel(logging.DEBUG if "--verbose" in sys.argv else logging.INFO)
+    listener.start()
     
     # Run the mapping process
-    result_path = asyncio.run(main(extracted_path, output_path))
+    try:
+        result_path = asyncio.run(main(extracted_path, output_path))
+    finally:
+        listener.stop()
     print(f"Mapped elements saved to: {result_path}")
\ No newline at end of file
@@ -3,36 +3,44 @@
 Test script to verify timing functionality
 """
 
-import asyncio
 import json
+from datetime import datetime, timedelta
 from final import JobApplicationBot
 
-async def test_timing():
+def test_timing():
     """Test the timing functionality without running a full application"""
     bot = JobApplicationBot()
     
+    # Fake clock advanced by hand, so no real time passes
+    now = [datetime(2024, 1, 1, 9, 0, 0)]
+    bot._clock = lambda: now[0]
+    
     # Simulate some questions being processed
     print("Testing timing functionality...")
     
     # Simulate question identification and filling
     bot._start_question_timing("What is your first name?", "firstName")
-    await asyncio.sleep(1.5)  # Simulate time to fill
+    now[0] += timedelta(seconds=1.5)  # Simulate time to fill
     bot._end_question_timing("What is your first name?", "firstName", "John")
     
     bot._start_question_timing("What is your email address?", "email")
-    await asyncio.sleep(2.3)  # Simulate time to fill
+    now[0] += timedelta(seconds=2.3)  # Simulate time to fill
     bot._end_question_timing("What is your email address?", "email", "john@example.com")
     
     bot._start_question_timing("Select your experience level", "experience")
-    await asyncio.sleep(0.8)  # Simulate time to fill
+    now[0] += timedelta(seconds=0.8)  # Simulate time to fill
     bot._end_question_timing("Select your experience level", "experience", "Senior")
     
     bot._start_question_timing("Upload your resume", "resume")
-    await asyncio.sleep(3.1)  # Simulate time to upload
+    now[0] += timedelta(seconds=3.1)  # Simulate time to upload
     bot._end_question_timing("Upload your resume", "resume", "resume.pdf")
     
     # Get timing summary
     timing_summary = bot.get_timing_summary()
+    assert timing_summary['total_questions'] == 4
+    assert timing_summary['total_time_ms'] == 7700
+    assert timing_summary['fastest_question_ms'] == 800
+    assert timing_summary['slowest_question_ms'] == 3100
     
     print("\n" + "="*50)
     print("TIMING SUMMARY TEST")
@@ -53,4 +61,4 @@ async def test_timing():
     print("\n✅ Timing functionality test completed successfully!")
 
 if __name__ == "__main__":
-    asyncio.run(test_timing())
+    test_timing()